@@ -10,6 +10,7 @@ import logging
 import time
 import threading
 from typing import Dict, List, Any, Optional
+import openai
 from openai import OpenAI
 import sentry_sdk
 
@@ -18,6 +19,17 @@ logger = logging.getLogger(__name__)
 # Valid models whitelist
 VALID_MODELS = ["gpt-4", "gpt-4-turbo", "gpt-4o", "gpt-4o-mini"]
 
+# Failures that will not go away on retry: rejected requests (4xx other than
+# 408/409/429) and programming errors. Everything else is retried.
+NON_RETRYABLE_ERRORS = (
+    openai.BadRequestError,
+    openai.AuthenticationError,
+    openai.PermissionDeniedError,
+    openai.NotFoundError,
+    openai.UnprocessableEntityError,
+    TypeError,
+)
+
 
 class OpenAIError(Exception):
     """Custom exception for OpenAI-related errors."""
@@ -87,12 +99,17 @@ class OpenAIClient:
             raise OpenAIError(f"Invalid model: {model}. Must be one of {VALID_MODELS}")
 
         last_error = None
+        attempts = 0
 
         for attempt in range(self.max_retries + 1):
             try:
+                # %-style arguments: only formatted if the record is emitted
                 logger.info(
-                    f"Making OpenAI request (attempt {attempt + 1}/{self.max_retries + 1}) "
-                    f"for job {job_id} using model {model}"
+                    "Making OpenAI request (attempt %d/%d) for job %s using model %s",
+                    attempt + 1,
+                    self.max_retries + 1,
+                    job_id,
+                    model,
                 )
 
                 response = self.client.chat.completions.create(
@@ -108,8 +125,11 @@ class OpenAIClient:
 
                 # Log successful request
                 logger.info(
-                    f"OpenAI request successful for job {job_id}: "
-                    f"{usage.prompt_tokens} prompt + {usage.completion_tokens} completion tokens"
+                    "OpenAI request successful for job %s: "
+                    "%s prompt + %s completion tokens",
+                    job_id,
+                    usage.prompt_tokens,
+                    usage.completion_tokens,
                 )
 
                 # Set Sentry context
@@ -133,22 +153,31 @@ class OpenAIClient:
 
             except Exception as e:
                 last_error = e
+                attempts = attempt + 1
                 logger.warning(
-                    f"OpenAI request failed (attempt {attempt + 1}/{self.max_retries + 1}) "
-                    f"for job {job_id}: {str(e)}"
+                    "OpenAI request failed (attempt %d/%d) for job %s: %s",
+                    attempt + 1,
+                    self.max_retries + 1,
+                    job_id,
+                    e,
                 )
 
                 # Capture error in Sentry
                 sentry_sdk.capture_exception(e)
 
-                # Don't retry on the last attempt
+                # Don't retry on the last attempt or on errors a retry
+                # cannot fix
+                if isinstance(e, NON_RETRYABLE_ERRORS):
+                    break
                 if attempt < self.max_retries:
                     time.sleep(self.retry_delay * (2**attempt))  # Exponential backoff
                 else:
                     break
 
         # If we get here, all retries failed
-        error_msg = f"OpenAI request failed after {self.max_retries + 1} attempts: {str(last_error)}"
+        error_msg = (
+            f"OpenAI request failed after {attempts} attempts: {str(last_error)}"
+        )
         logger.error(error_msg)
         raise OpenAIError(error_msg)
 
@@ -6,6 +6,7 @@ Implements secure error handling and circuit breaker patterns.
 import os
 import time
 import logging
+import threading
 from typing import Optional, Dict, Any, Callable
 from enum import Enum
 from functools import wraps
@@ -58,6 +59,9 @@ class CircuitBreaker:
         self.failure_count = 0
         self.last_failure_time = None
         self.state = CircuitBreakerState.CLOSED
+        # Breakers are module-level singletons shared by request threads, so
+        # the count/state read-modify-writes must not interleave
+        self._lock = threading.Lock()
 
         logger.info(
             f"Circuit breaker '{name}' initialized with threshold {failure_threshold}"
@@ -65,12 +69,17 @@ class CircuitBreaker:
 
     def call(self, func: Callable, *args, **kwargs):
         """Execute function with circuit breaker protection."""
-        if self.state == CircuitBreakerState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitBreakerState.HALF_OPEN
-                logger.info(f"Circuit breaker '{self.name}' entering HALF_OPEN state")
-            else:
-                raise CircuitBreakerOpenError(f"Circuit breaker '{self.name}' is OPEN")
+        with self._lock:
+            if self.state == CircuitBreakerState.OPEN:
+                if self._should_attempt_reset():
+                    self.state = CircuitBreakerState.HALF_OPEN
+                    logger.info(
+                        f"Circuit breaker '{self.name}' entering HALF_OPEN state"
+                    )
+                else:
+                    raise CircuitBreakerOpenError(
+                        f"Circuit breaker '{self.name}' is OPEN"
+                    )
 
         try:
             result = func(*args, **kwargs)
@@ -89,20 +98,22 @@ class CircuitBreaker:
 
     def _on_success(self):
         """Handle successful call."""
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = CircuitBreakerState.CLOSED
+        with self._lock:
+            self.failure_count = 0
+            self.last_failure_time = None
+            self.state = CircuitBreakerState.CLOSED
 
     def _on_failure(self):
         """Handle failed call."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-
-        if self.failure_count >= self.failure_threshold:
-            self.state = CircuitBreakerState.OPEN
-            logger.warning(
-                f"Circuit breaker '{self.name}' opened after {self.failure_count} failures"
-            )
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.time()
+
+            if self.failure_count >= self.failure_threshold:
+                self.state = CircuitBreakerState.OPEN
+                logger.warning(
+                    f"Circuit breaker '{self.name}' opened after {self.failure_count} failures"
+                )
 
 
 class SecureRedisClient:
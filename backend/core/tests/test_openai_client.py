@@ -119,6 +119,19 @@ class TestOpenAIClient:
                 model="gpt-4o-mini",
             )
 
+    def test_chat_completion_does_not_retry_permanent_errors(self):
+        """Test that errors a retry cannot fix fail on the first attempt."""
+        client = OpenAIClient(api_key="test-key-12345")
+        client.client = MagicMock()
+        client.client.chat.completions.create.side_effect = TypeError("bad argument")
+
+        with pytest.raises(OpenAIError, match="after 1 attempts"):
+            client.chat_completion(
+                messages=[{"role": "user", "content": "Test prompt"}],
+                model="gpt-4o-mini",
+            )
+        assert client.client.chat.completions.create.call_count == 1
+
     def test_estimate_cost(self):
         """Test cost estimation for different models."""
         client = OpenAIClient(api_key="test-key-12345")
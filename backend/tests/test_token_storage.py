@@ -3,6 +3,9 @@ Unit tests for token storage functionality.
 """
 
 import json
+import threading
+from datetime import datetime
+import utils.token_storage as token_storage
 from utils.token_storage import (
     save_token_usage,
     get_token_usage,
@@ -71,6 +74,16 @@ class TestTokenUsageStorage:
         assert "linkedin" in saved_data["channels"]
         assert "twitter" in saved_data["channels"]
 
+    def test_token_usage_timestamps_are_iso_strings(self, clean_storage):
+        """Test stored timestamps are rendered as ISO-8601 strings on read."""
+        save_token_usage("job_ts", {"total_tokens": 10}, "gpt-4o-mini", "linkedin")
+
+        saved_data = get_token_usage("job_ts")
+
+        datetime.fromisoformat(saved_data["created_at"])
+        entry = saved_data["channels"]["linkedin"][0]
+        datetime.fromisoformat(entry["timestamp"])
+
     def test_save_token_usage_invalid_data(self, clean_storage):
         """Test saving token usage with invalid data."""
         job_id = "test_job_3"
@@ -102,6 +115,26 @@ class TestTokenUsageStorage:
         assert all_data["job_1"]["total_tokens"] == 100
         assert all_data["job_2"]["total_tokens"] == 200
 
+    def test_save_token_usage_concurrent_jobs(self, clean_storage):
+        """Test concurrent saves across jobs keep records and stats consistent."""
+
+        def worker(job_id):
+            for _ in range(20):
+                save_token_usage(job_id, {"total_tokens": 5}, "gpt-4o-mini", "x")
+
+        threads = [
+            threading.Thread(target=worker, args=(f"job_{i}",)) for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        all_data = get_all_token_usage()
+        assert len(all_data) == 4
+        assert all(record["total_tokens"] == 100 for record in all_data.values())
+        assert get_token_usage_stats()["total_tokens"] == 400
+
 
 class TestJobRecordStorage:
     """Test job record storage functionality."""
@@ -128,6 +161,8 @@ class TestJobRecordStorage:
         assert saved_record["input_text"] == "Test input"
         assert "created_at" in saved_record
         assert "updated_at" in saved_record
+        datetime.fromisoformat(saved_record["created_at"])
+        datetime.fromisoformat(saved_record["updated_at"])
 
     def test_save_job_record_invalid_data(self, clean_storage):
         """Test saving job record with invalid data."""
@@ -196,6 +231,25 @@ class TestTokenUsageStats:
         assert stats["total_tokens"] == 100
         assert stats["avg_tokens_per_job"] == 100
 
+    def test_get_token_usage_stats_tracks_updates_and_clear(self, clean_storage):
+        """Test stats follow repeated saves to a job and reset on clear."""
+        save_token_usage("job_1", {"total_tokens": 100}, "gpt-4o-mini", "linkedin")
+        save_token_usage("job_1", {"total_tokens": 50}, "gpt-4o", "twitter")
+
+        stats = get_token_usage_stats()
+
+        assert stats["total_jobs"] == 1
+        assert stats["total_tokens"] == 150
+        # Usage is attributed to the model the job was created with
+        assert stats["model_usage"] == {"gpt-4o-mini": 150}
+
+        clear_all_data()
+        stats = get_token_usage_stats()
+
+        assert stats["total_tokens"] == 0
+        assert stats["total_cost"] == 0
+        assert stats["model_usage"] == {}
+
 
 class TestExportFunctionality:
     """Test export functionality."""
@@ -249,3 +303,61 @@ class TestClearData:
         assert get_job_record("job_1") is None
         assert get_all_token_usage() == {}
         assert get_all_job_records() == {}
+
+
+class TestPersistenceFormat:
+    """Test the on-disk encoding of persisted data."""
+
+    def test_round_trip(self):
+        """Test encoded payloads decode back to the same data."""
+        data = {"token_usage": {"job_1": {"total_tokens": 5}}, "job_records": {}}
+
+        encoded = token_storage._encode_persistent_data(data)
+
+        assert token_storage._decode_persistent_data(encoded) == data
+
+    def test_reads_legacy_json(self):
+        """Test indented JSON written by earlier versions is still readable."""
+        data = {"token_usage": {}, "job_records": {"job_1": {"status": "done"}}}
+
+        raw = json.dumps(data, indent=2).encode("utf-8")
+
+        assert token_storage._decode_persistent_data(raw) == data
+
+    def test_unchanged_state_is_not_rewritten(
+        self, clean_storage, tmp_path, monkeypatch
+    ):
+        """Test saving identical state twice only writes the file once."""
+        path = tmp_path / "token_usage.json"
+        monkeypatch.setattr(token_storage, "PERSISTENCE_FILE", str(path))
+        monkeypatch.setattr(token_storage, "_last_saved_digest", None)
+
+        clear_all_data()
+        assert path.exists()
+        path.unlink()
+
+        clear_all_data()
+        assert not path.exists()
+
+        save_token_usage("job_1", {"total_tokens": 1}, "gpt-4o-mini", "linkedin")
+        assert path.exists()
+
+    def test_loads_legacy_json_file_when_default_file_missing(
+        self, tmp_path, monkeypatch
+    ):
+        """Test data saved under the old JSON name is loaded from there."""
+        legacy = tmp_path / "token_usage.json"
+        legacy.write_text(
+            json.dumps({"token_usage": {}, "job_records": {"job_1": {"n": 1}}})
+        )
+        monkeypatch.delenv("TOKEN_STORAGE_FILE", raising=False)
+        monkeypatch.setattr(
+            token_storage, "PERSISTENCE_FILE", str(tmp_path / "token_usage.msgpack")
+        )
+        monkeypatch.setattr(token_storage, "_LEGACY_PERSISTENCE_FILE", str(legacy))
+        monkeypatch.setattr(token_storage, "_token_usage_storage", {})
+        monkeypatch.setattr(token_storage, "_job_storage", {})
+
+        token_storage._load_persistent_data()
+
+        assert token_storage._job_storage == {"job_1": {"n": 1}}
@@ -1,17 +1,21 @@
+import pytest
 from fastapi.testclient import TestClient
 from ..router import router
 
 
+@pytest.fixture(scope="module")
+def client():
+    """Shared test client; the router is stateless so one per module is enough."""
+    with TestClient(router) as test_client:
+        yield test_client
+
+
 class TestHelloRouter:
     """Test cases for the Hello World tool router."""
 
-    def setup_method(self):
-        """Set up test client."""
-        self.client = TestClient(router)
-
-    def test_ping_post(self):
+    def test_ping_post(self, client):
         """Test POST /ping endpoint."""
-        response = self.client.post("/ping", json={"message": "Test message"})
+        response = client.post("/ping", json={"message": "Test message"})
         assert response.status_code == 200
 
         data = response.json()
@@ -20,18 +24,18 @@ class TestHelloRouter:
         assert data["status"] == "success"
         assert "timestamp" in data
 
-    def test_ping_post_default_message(self):
+    def test_ping_post_default_message(self, client):
         """Test POST /ping endpoint with default message."""
-        response = self.client.post("/ping", json={})
+        response = client.post("/ping", json={})
         assert response.status_code == 200
 
         data = response.json()
         assert data["message"] == "Hello! You said: Hello"
         assert data["tool"] == "hello"
 
-    def test_ping_get(self):
+    def test_ping_get(self, client):
         """Test GET /ping endpoint."""
-        response = self.client.get("/ping")
+        response = client.get("/ping")
         assert response.status_code == 200
 
         data = response.json()
@@ -39,9 +43,9 @@ class TestHelloRouter:
         assert data["tool"] == "hello"
         assert data["status"] == "success"
 
-    def test_info(self):
+    def test_info(self, client):
         """Test /info endpoint."""
-        response = self.client.get("/info")
+        response = client.get("/info")
         assert response.status_code == 200
 
         data = response.json()
@@ -55,9 +59,9 @@ class TestHelloRouter:
         assert isinstance(data["features"], list)
         assert len(data["features"]) > 0
 
-    def test_config(self):
+    def test_config(self, client):
         """Test /config endpoint."""
-        response = self.client.get("/config")
+        response = client.get("/config")
         assert response.status_code == 200
 
         data = response.json()
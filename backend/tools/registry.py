@@ -5,6 +5,7 @@ This module provides dynamic tool discovery and registration for the Kyros Dashb
 It allows the system to automatically discover and register tool routers.
 """
 
+import functools
 import importlib
 import logging
 from typing import List, Dict, Any, Tuple, Optional
@@ -27,6 +28,20 @@ TOOLS = [
 ]
 
 
+@functools.lru_cache(maxsize=None)
+def _import_tool(module_path: str):
+    """
+    Import a tool module once and reuse it on later router loads.
+
+    Args:
+        module_path: Dotted module path of the tool.
+
+    Returns:
+        The imported module.
+    """
+    return importlib.import_module(module_path)
+
+
 def load_tool_routers() -> List[Tuple[str, APIRouter]]:
     """
     Dynamically load and return all enabled tool routers.
@@ -59,7 +74,7 @@ def load_tool_routers() -> List[Tuple[str, APIRouter]]:
 
         try:
             # Import the tool module
-            module = importlib.import_module(tool["module"])
+            module = _import_tool(tool["module"])
 
             # Get the router from the module
             router = getattr(module, tool["router"])
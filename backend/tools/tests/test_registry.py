@@ -1,4 +1,9 @@
 from unittest.mock import patch, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
 from ..registry import (
     load_tool_routers,
     get_tools_metadata,
@@ -9,12 +14,27 @@ from ..registry import (
     add_tool,
     remove_tool,
     TOOLS,
+    _import_tool,
 )
 
 
+@pytest.fixture(scope="module")
+def tools_client():
+    """In-process client for an app with every enabled tool router mounted once."""
+    _import_tool.cache_clear()
+    app = FastAPI()
+    for name, router in load_tool_routers():
+        app.include_router(router, prefix=f"/api/tools/{name}")
+    return TestClient(app)
+
+
 class TestToolsRegistry:
     """Test cases for the tools registry module."""
 
+    def setup_method(self):
+        """Drop cached tool imports so patched import_module is honored."""
+        _import_tool.cache_clear()
+
     def test_get_tools_metadata(self):
         """Test getting metadata for all tools."""
         metadata = get_tools_metadata()
@@ -202,6 +222,28 @@ class TestToolsRegistry:
         # Re-enable for other tests
         enable_tool("hello")
 
+    def test_load_tool_routers_mountable(self, tools_client):
+        """Test that loaded routers serve requests once mounted on an app."""
+        response = tools_client.get("/api/tools/hello/ping")
+        assert response.status_code == 200
+        assert response.json()["tool"] == "hello"
+
+    @patch("tools.registry.importlib.import_module")
+    def test_load_tool_routers_caches_imports(self, mock_import):
+        """Test that repeated loads reuse the imported tool module."""
+        from fastapi import APIRouter
+
+        mock_module = MagicMock()
+        mock_module.router = APIRouter()
+        mock_import.return_value = mock_module
+
+        load_tool_routers()
+        load_tool_routers()
+
+        assert mock_import.call_count == len(
+            [t for t in TOOLS if t.get("enabled", True)]
+        )
+
     def test_tools_constant_structure(self):
         """Test that TOOLS constant has the expected structure."""
         assert isinstance(TOOLS, list)
@@ -5,63 +5,171 @@ This is a simple in-memory implementation that can be replaced with a real datab
 
 import json
 import copy
+import hashlib
 import os
 import threading
+import time
 from datetime import datetime
 from typing import Dict, Optional, Any
 import logging
 
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; fall back to compact JSON
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
 # In-memory storage for token usage (in production, this would be a database)
 _token_usage_storage = {}
 _job_storage = {}
 
-# Thread safety
-_storage_lock = threading.RLock()
+# Running aggregates over _token_usage_storage, kept in step by every write so
+# get_token_usage_stats() never has to walk the full history.
+_stats = {"total_tokens": 0, "total_cost": 0.0, "model_usage": {}}
+
+# Thread safety: persistence rewrites the whole file from both stores, so one
+# lock guards every read and write
+_storage_lock = threading.Lock()
 
 # Configuration
 DEFAULT_TOKEN_COST = float(
     os.getenv("TOKEN_COST_PER_TOKEN", "0.0001")
 )  # Default cost per token
-PERSISTENCE_FILE = os.getenv("TOKEN_STORAGE_FILE", "token_usage.json")
+# The default name follows the encoding; data saved as JSON before msgpack was
+# installed is still read from the old name and moves on the next save
+_LEGACY_PERSISTENCE_FILE = "token_usage.json"
+PERSISTENCE_FILE = os.getenv("TOKEN_STORAGE_FILE") or (
+    "token_usage.msgpack" if msgpack is not None else _LEGACY_PERSISTENCE_FILE
+)
+
+# Digest of the last payload written, used to skip rewriting identical state
+_last_saved_digest: Optional[bytes] = None
 
 
 def _serialize_datetime(obj):
-    """Custom JSON serializer for datetime objects."""
+    """Custom JSON/msgpack serializer for datetime objects."""
     if isinstance(obj, datetime):
         return obj.isoformat()
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
+def _format_timestamp(value):
+    """Render a stored time.time_ns() value as an ISO-8601 string.
+
+    Values that are already strings (e.g. from older persisted files) are
+    returned unchanged.
+    """
+    if isinstance(value, int):
+        return datetime.fromtimestamp(value / 1e9).isoformat()
+    return value
+
+
+def _format_usage_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a deep copy of a token usage record with readable timestamps."""
+    record = copy.deepcopy(record)
+    record["created_at"] = _format_timestamp(record.get("created_at"))
+    for entries in record.get("channels", {}).values():
+        for entry in entries:
+            entry["timestamp"] = _format_timestamp(entry.get("timestamp"))
+    return record
+
+
+def _format_job_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a deep copy of a job record with readable timestamps."""
+    record = copy.deepcopy(record)
+    for key in ("created_at", "updated_at"):
+        record[key] = _format_timestamp(record.get(key))
+    return record
+
+
+def _encode_persistent_data(data: Dict[str, Any]) -> bytes:
+    """Serialize the persistence payload, preferring msgpack when installed."""
+    if msgpack is not None:
+        return msgpack.packb(data, default=_serialize_datetime)
+    encoded = json.dumps(data, separators=(",", ":"), default=_serialize_datetime)
+    return encoded.encode("utf-8")
+
+
+def _decode_persistent_data(raw: bytes) -> Dict[str, Any]:
+    """Deserialize the persistence payload.
+
+    JSON files written by earlier versions start with '{' and are still read,
+    so existing data migrates to msgpack on the next save.
+    """
+    if raw.lstrip()[:1] == b"{":
+        return json.loads(raw)
+    if msgpack is None:
+        raise ValueError("msgpack is required to read binary token storage data")
+    return msgpack.unpackb(raw, raw=False)
+
+
+def _reset_stats():
+    """Zero the running aggregates."""
+    _stats["total_tokens"] = 0
+    _stats["total_cost"] = 0.0
+    _stats["model_usage"] = {}
+
+
+def _record_stats(model: str, total_tokens: int, cost: float):
+    """Fold a single usage increment into the running aggregates."""
+    _stats["total_tokens"] += total_tokens
+    _stats["total_cost"] += cost
+    model_usage = _stats["model_usage"]
+    model_usage[model] = model_usage.get(model, 0) + total_tokens
+
+
+def _rebuild_stats():
+    """Recompute the running aggregates from the stored records."""
+    _reset_stats()
+    for record in _token_usage_storage.values():
+        _record_stats(
+            record.get("model", "unknown"),
+            record["total_tokens"],
+            record["total_cost"],
+        )
+
+
 def _load_persistent_data():
     """Load data from persistent storage."""
     global _token_usage_storage, _job_storage
 
-    if not os.path.exists(PERSISTENCE_FILE):
-        return
+    path = PERSISTENCE_FILE
+    if not os.path.exists(path):
+        if os.getenv("TOKEN_STORAGE_FILE") or not os.path.exists(
+            _LEGACY_PERSISTENCE_FILE
+        ):
+            return
+        path = _LEGACY_PERSISTENCE_FILE
 
     try:
-        with open(PERSISTENCE_FILE, "r") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = _decode_persistent_data(f.read())
             _token_usage_storage = data.get("token_usage", {})
             _job_storage = data.get("job_records", {})
-        logger.info(f"Loaded persistent data from {PERSISTENCE_FILE}")
+        _rebuild_stats()
+        logger.info(f"Loaded persistent data from {path}")
     except Exception as e:
         logger.error(f"Failed to load persistent data: {str(e)}")
 
 
 def _save_persistent_data():
-    """Save data to persistent storage."""
+    """Save data to persistent storage, skipping the write if nothing changed."""
+    global _last_saved_digest
+
     try:
         data = {
             "token_usage": _token_usage_storage,
             "job_records": _job_storage,
-            "saved_at": datetime.now().isoformat(),
         }
-
-        with open(PERSISTENCE_FILE, "w") as f:
-            json.dump(data, f, indent=2, default=_serialize_datetime)
+        payload = _encode_persistent_data(data)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest == _last_saved_digest:
+            return
+
+        with open(PERSISTENCE_FILE, "wb") as f:
+            f.write(payload)
+        _last_saved_digest = digest
         logger.debug(f"Saved persistent data to {PERSISTENCE_FILE}")
     except Exception as e:
         logger.error(f"Failed to save persistent data: {str(e)}")
@@ -88,38 +196,35 @@ def save_token_usage(
     """
     with _storage_lock:
         try:
-            if job_id not in _token_usage_storage:
-                _token_usage_storage[job_id] = {
+            # Update total tokens and cost (configurable cost per token)
+            total_tokens = token_usage.get("total_tokens", 0)
+            cost = total_tokens * DEFAULT_TOKEN_COST
+            now = time.time_ns()
+
+            record = _token_usage_storage.get(job_id)
+            if record is None:
+                record = _token_usage_storage[job_id] = {
                     "job_id": job_id,
-                    "created_at": datetime.now().isoformat(),
+                    "created_at": now,
                     "total_tokens": 0,
                     "total_cost": 0.0,
                     "channels": {},
                     "model": model,
                 }
 
-            # Update total tokens and cost (configurable cost per token)
-            total_tokens = token_usage.get("total_tokens", 0)
-            _token_usage_storage[job_id]["total_tokens"] += total_tokens
-            _token_usage_storage[job_id]["total_cost"] += (
-                total_tokens * DEFAULT_TOKEN_COST
-            )
+            record["total_tokens"] += total_tokens
+            record["total_cost"] += cost
+            _record_stats(record.get("model", "unknown"), total_tokens, cost)
 
             # Store per-channel usage (maintain list of entries per channel)
-            if "channels" not in _token_usage_storage[job_id]:
-                _token_usage_storage[job_id]["channels"] = {}
-
-            if channel not in _token_usage_storage[job_id]["channels"]:
-                _token_usage_storage[job_id]["channels"][channel] = []
-
-            # Create usage dict and append to list
-            usage_entry = {
-                "prompt_tokens": token_usage.get("prompt_tokens", 0),
-                "completion_tokens": token_usage.get("completion_tokens", 0),
-                "total_tokens": total_tokens,
-                "timestamp": datetime.now().isoformat(),
-            }
-            _token_usage_storage[job_id]["channels"][channel].append(usage_entry)
+            record["channels"].setdefault(channel, []).append(
+                {
+                    "prompt_tokens": token_usage.get("prompt_tokens", 0),
+                    "completion_tokens": token_usage.get("completion_tokens", 0),
+                    "total_tokens": total_tokens,
+                    "timestamp": now,
+                }
+            )
 
             # Save to persistent storage
             _save_persistent_data()
@@ -144,7 +249,7 @@ def get_token_usage(job_id: str) -> Optional[Dict[str, Any]]:
     """
     with _storage_lock:
         data = _token_usage_storage.get(job_id)
-        return copy.deepcopy(data) if data else None
+        return _format_usage_record(data) if data else None
 
 
 def get_all_token_usage() -> Dict[str, Dict[str, Any]]:
@@ -155,7 +260,10 @@ def get_all_token_usage() -> Dict[str, Dict[str, Any]]:
         Dict of all token usage records
     """
     with _storage_lock:
-        return copy.deepcopy(_token_usage_storage)
+        return {
+            job_id: _format_usage_record(record)
+            for job_id, record in _token_usage_storage.items()
+        }
 
 
 def save_job_record(job_id: str, job_data: Dict[str, Any]) -> bool:
@@ -172,19 +280,18 @@ def save_job_record(job_id: str, job_data: Dict[str, Any]) -> bool:
     with _storage_lock:
         try:
             # Preserve original created_at when updating existing job
+            now = time.time_ns()
             if job_id in _job_storage:
                 existing_record = _job_storage[job_id]
-                created_at = existing_record.get(
-                    "created_at", datetime.now().isoformat()
-                )
+                created_at = existing_record.get("created_at", now)
             else:
-                created_at = datetime.now().isoformat()
+                created_at = now
 
             _job_storage[job_id] = copy.deepcopy(
                 {
                     **job_data,
                     "created_at": created_at,
-                    "updated_at": datetime.now().isoformat(),
+                    "updated_at": now,
                 }
             )
 
@@ -211,7 +318,7 @@ def get_job_record(job_id: str) -> Optional[Dict[str, Any]]:
     """
     with _storage_lock:
         data = _job_storage.get(job_id)
-        return copy.deepcopy(data) if data else None
+        return _format_job_record(data) if data else None
 
 
 def get_all_job_records() -> Dict[str, Dict[str, Any]]:
@@ -222,7 +329,28 @@ def get_all_job_records() -> Dict[str, Dict[str, Any]]:
         Dict of all job records
     """
     with _storage_lock:
-        return copy.deepcopy(_job_storage)
+        return {
+            job_id: _format_job_record(record)
+            for job_id, record in _job_storage.items()
+        }
+
+
+def _compute_stats() -> Dict[str, Any]:
+    """Build the statistics payload. Caller must hold _storage_lock."""
+    total_jobs = len(_token_usage_storage)
+    total_tokens = _stats["total_tokens"]
+
+    # Calculate average tokens per job
+    avg_tokens_per_job = total_tokens / total_jobs if total_jobs > 0 else 0
+
+    return {
+        "total_jobs": total_jobs,
+        "total_tokens": total_tokens,
+        "total_cost": _stats["total_cost"],
+        "avg_tokens_per_job": avg_tokens_per_job,
+        "model_usage": dict(_stats["model_usage"]),
+        "last_updated": datetime.now().isoformat(),
+    }
 
 
 def get_token_usage_stats() -> Dict[str, Any]:
@@ -233,31 +361,7 @@ def get_token_usage_stats() -> Dict[str, Any]:
         Dict containing usage statistics
     """
     with _storage_lock:
-        total_jobs = len(_token_usage_storage)
-        total_tokens = sum(
-            record["total_tokens"] for record in _token_usage_storage.values()
-        )
-        total_cost = sum(
-            record["total_cost"] for record in _token_usage_storage.values()
-        )
-
-        # Calculate average tokens per job
-        avg_tokens_per_job = total_tokens / total_jobs if total_jobs > 0 else 0
-
-        # Get model usage breakdown
-        model_usage = {}
-        for record in _token_usage_storage.values():
-            model = record.get("model", "unknown")
-            model_usage[model] = model_usage.get(model, 0) + record["total_tokens"]
-
-        return {
-            "total_jobs": total_jobs,
-            "total_tokens": total_tokens,
-            "total_cost": total_cost,
-            "avg_tokens_per_job": avg_tokens_per_job,
-            "model_usage": model_usage,
-            "last_updated": datetime.now().isoformat(),
-        }
+        return _compute_stats()
 
 
 def export_token_usage_data() -> str:
@@ -269,9 +373,15 @@ def export_token_usage_data() -> str:
     """
     with _storage_lock:
         export_data = {
-            "token_usage": _token_usage_storage,
-            "job_records": _job_storage,
-            "statistics": get_token_usage_stats(),
+            "token_usage": {
+                job_id: _format_usage_record(record)
+                for job_id, record in _token_usage_storage.items()
+            },
+            "job_records": {
+                job_id: _format_job_record(record)
+                for job_id, record in _job_storage.items()
+            },
+            "statistics": _compute_stats(),
             "exported_at": datetime.now().isoformat(),
         }
 
@@ -289,6 +399,7 @@ def clear_all_data() -> bool:
         try:
             _token_usage_storage.clear()
             _job_storage.clear()
+            _reset_stats()
 
             # Save empty state to persistent storage
             _save_persistent_data()
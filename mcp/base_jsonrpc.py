@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 import json
+import os
 import sys
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 
 class JSONRPCServer:
-    def __init__(self):
+    def __init__(self, workers: int | None = None):
         self.methods = {}
+        # workers > 0 runs handlers on a thread pool so slow calls (network,
+        # disk) overlap; responses may then arrive out of request order and
+        # are matched by id. Handlers must be thread-safe to enable this.
+        if workers is None:
+            workers = int(os.getenv("MCP_RPC_WORKERS", "0"))
+        self.workers = workers
+        self._send_lock = threading.Lock()
 
     def method(self, name):
         def deco(fn):
@@ -16,8 +26,10 @@ class JSONRPCServer:
         return deco
 
     def _send(self, obj):
-        sys.stdout.write(json.dumps(obj, ensure_ascii=False) + "\n")
-        sys.stdout.flush()
+        line = json.dumps(obj, ensure_ascii=False) + "\n"
+        with self._send_lock:
+            sys.stdout.write(line)
+            sys.stdout.flush()
 
     def _error(self, _id, code, message, data=None):
         err = {"code": code, "message": message}
@@ -25,7 +37,26 @@ class JSONRPCServer:
             err["data"] = data
         self._send({"jsonrpc": "2.0", "id": _id, "error": err})
 
+    def _call(self, _id, fn, params):
+        # Sending is inside the try: on the pool an exception escaping here is
+        # kept in a future nobody reads, and the client would never get a reply
+        try:
+            result = fn(params)
+            self._send({"jsonrpc": "2.0", "id": _id, "result": result})
+        except Exception as e:
+            tb = traceback.format_exc()
+            self._error(_id, -32603, str(e), {"traceback": tb})
+
     def serve(self):
+        if self.workers > 0:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                # Leaving the block waits for in-flight calls, so every
+                # request read before EOF still gets its response
+                self._serve(pool.submit)
+        else:
+            self._serve(lambda call, *args: call(*args))
+
+    def _serve(self, dispatch):
         # Line-delimited JSON-RPC over stdio (simple scaffolding)
         for line in sys.stdin:
             line = line.strip()
@@ -53,8 +84,7 @@ class JSONRPCServer:
                 if not fn:
                     self._error(_id, -32601, f"Method not found: {method}")
                     continue
-                result = fn(params)
-                self._send({"jsonrpc": "2.0", "id": _id, "result": result})
+                dispatch(self._call, _id, fn, params)
             except Exception as e:
                 tb = traceback.format_exc()
                 self._error(None, -32603, str(e), {"traceback": tb})
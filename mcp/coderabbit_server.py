@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from mcp.base_jsonrpc import JSONRPCServer
 from mcp.env import load_dotenvs
 
 load_dotenvs()
 
+# Read once at import; the server process doesn't see later env changes
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+
 srv = JSONRPCServer()
 
+# One pooled keep-alive session so repeated GitHub calls reuse TLS connections
+_session = requests.Session()
+_session.headers.update({"Accept": "application/vnd.github+json"})
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 @srv.method("coderabbit.request_review")
 def request_review(params):
@@ -25,50 +34,56 @@ def fetch_feedback(params):
     pr = params.get("pr")
     if not (owner and repo and pr):
         raise ValueError("owner, repo, pr required")
-    token = os.getenv("GITHUB_TOKEN")
-    headers = {"Accept": "application/vnd.github+json"}
+    # Optional ISO-8601 timestamp; comment endpoints filter server-side
+    since = params.get("since")
+    token = GITHUB_TOKEN
+    headers = {}
     if token:
         headers["Authorization"] = f"Bearer {token}"
+    page = {"per_page": 100}
+    comment_page = {**page, "since": since} if since else page
     base = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr}"
-    reviews = requests.get(base + "/reviews", headers=headers, timeout=30)
+    reviews = _session.get(base + "/reviews", headers=headers, params=page, timeout=30)
     reviews.raise_for_status()
-    comments = requests.get(base + "/comments", headers=headers, timeout=30)
+    comments = _session.get(
+        base + "/comments", headers=headers, params=comment_page, timeout=30
+    )
     comments.raise_for_status()
-    issues_comments = requests.get(
+    issues_comments = _session.get(
         f"https://api.github.com/repos/{owner}/{repo}/issues/{pr}/comments",
         headers=headers,
+        params=comment_page,
         timeout=30,
     )
     issues_comments.raise_for_status()
-    feedback = []
-    for r in reviews.json():
-        if r.get("state") == "CHANGES_REQUESTED":
-            feedback.append(
-                {
-                    "type": "review",
-                    "author": r.get("user", {}).get("login"),
-                    "state": r.get("state"),
-                    "body": r.get("body"),
-                }
-            )
-    for c in comments.json():
-        feedback.append(
-            {
-                "type": "diff_comment",
-                "file": c.get("path"),
-                "line": c.get("line"),
-                "author": c.get("user", {}).get("login"),
-                "body": c.get("body"),
-            }
-        )
-    for ic in issues_comments.json():
-        feedback.append(
-            {
-                "type": "issue_comment",
-                "author": ic.get("user", {}).get("login"),
-                "body": ic.get("body"),
-            }
-        )
+    feedback = [
+        {
+            "type": "review",
+            "author": r.get("user", {}).get("login"),
+            "state": r.get("state"),
+            "body": r.get("body"),
+        }
+        for r in reviews.json()
+        if r.get("state") == "CHANGES_REQUESTED"
+    ]
+    feedback.extend(
+        {
+            "type": "diff_comment",
+            "file": c.get("path"),
+            "line": c.get("line"),
+            "author": c.get("user", {}).get("login"),
+            "body": c.get("body"),
+        }
+        for c in comments.json()
+    )
+    feedback.extend(
+        {
+            "type": "issue_comment",
+            "author": ic.get("user", {}).get("login"),
+            "body": ic.get("body"),
+        }
+        for ic in issues_comments.json()
+    )
     return {"owner": owner, "repo": repo, "pr": pr, "suggestions": feedback}
 
 
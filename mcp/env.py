@@ -8,14 +8,23 @@ Behavior:
   2) collaboration/.env
   without overriding already-set env vars.
 - Silent no-op if python-dotenv is not installed.
+- Only the first call does any work; every MCP server calls this at import,
+  so later calls return immediately without touching the filesystem.
 """
 
 from __future__ import annotations
 
 from pathlib import Path
 
+_loaded = False
+
 
 def load_dotenvs() -> None:
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+
     try:
         from dotenv import load_dotenv
     except Exception:
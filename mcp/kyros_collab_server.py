@@ -1,12 +1,38 @@
 #!/usr/bin/env python3
+import atexit
+import contextlib
+import functools
 import hashlib
+import heapq
+import itertools
 import json
 import os
+import secrets
+import signal
+import sys
+import time
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 
 from mcp.base_jsonrpc import JSONRPCServer
 from mcp.env import load_dotenvs
+from mcp.rwlock import RWLock
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json produces the same layout
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks (Windows): writes stay etag-checked only
+    fcntl = None
+
+try:
+    import fastjsonschema
+except ImportError:  # fastjsonschema is optional; jsonschema is the fallback
+    fastjsonschema = None
 
 # Load .env files early (no override)
 load_dotenvs()
@@ -23,6 +49,12 @@ LOGS = BASE / "logs" / "log.md"
 
 TTL_SECONDS = int(os.getenv("COLLAB_TTL", "900"))
 HEARTBEAT_SECONDS = int(os.getenv("COLLAB_HEARTBEAT", "300"))
+# Event log durability per emitted event: "none" (buffered until exit),
+# "flush" (visible to other readers) or "fsync" (flushed and synced to disk)
+EVENT_DURABILITY = os.getenv("COLLAB_EVENT_DURABILITY", "flush")
+# State writes fsync the temp file and the parent directory unless disabled
+FSYNC_FILE = os.getenv("COLLAB_FSYNC_FILE", "1").lower() not in ("0", "false", "no")
+FSYNC_DIR = os.getenv("COLLAB_FSYNC_DIR", "1").lower() not in ("0", "false", "no")
 
 # Task lifecycle definitions
 ALLOWED_STATUSES = [
@@ -53,36 +85,359 @@ ALLOWED_TRANSITIONS = {
     "done": [],
 }
 
+# Agent pools for suggest_assignee. Rules are checked in order, so a task
+# labelled both "backend" and "frontend" goes to the backend pool.
+BACKEND_POOL = ("codex-cli-1", "codex-cli-2")
+FRONTEND_POOL = ("cursor-ide", "cursor-ide-2")
+DOCS_POOL = ("gemini-cli-1",)
+DEFAULT_POOL = BACKEND_POOL + FRONTEND_POOL
+_POOL_RULES = (
+    (frozenset({"backend", "devops", "ci"}), BACKEND_POOL),
+    (frozenset({"frontend", "e2e"}), FRONTEND_POOL),
+    (frozenset({"docs", "review"}), DOCS_POOL),
+)
+
+
+def _etag_hasher():
+    # BLAKE2b-128: faster than sha256 and in hashlib on every install. It must
+    # match etag_hex in scripts/collab_cli.py, which writes the same state files
+    # and logs its etags to the same events.jsonl
+    return hashlib.blake2b(digest_size=16)
 
-def sha256_hex(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+
+def etag_hex(data: bytes) -> str:
+    h = _etag_hasher()
+    h.update(data)
+    return h.hexdigest()
 
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+def _dumps_state(data: dict) -> bytes:
+    """Serialize a state document as 2-space indented UTF-8 JSON + newline."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        )
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _loads_state(raw: bytes | bytearray) -> dict:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+# State files keyed by path: (stat key, raw bytes, etag, shared parsed dict or
+# None until a reader asks for it)
+_json_cache: dict[
+    Path, tuple[tuple[int, int, int], bytes | bytearray, str, dict | None]
+] = {}
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int, int]:
+    # Writers replace the file, so the inode changes on every write; mtime and
+    # size alone can repeat when two same-sized writes land in one clock tick
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _fsync(fd: int):
+    if sys.platform == "darwin":
+        # Plain fsync on macOS does not flush the drive's write cache
+        fcntl.fcntl(fd, fcntl.F_FULLFSYNC)
+    else:
+        os.fsync(fd)
+
+
+def _write_file_durable(path: Path, payload: bytes):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+        if FSYNC_FILE:
+            _fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path: Path):
+    if os.name != "posix":
+        return
+    dfd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(dfd)
+    finally:
+        os.close(dfd)
+
+
+def _read_raw(path: Path) -> tuple[bytearray, str]:
+    # Hash each chunk as it is read, while it is still in cache, instead of
+    # hashing the whole file in a second pass after reading it
+    h = _etag_hasher()
+    raw = bytearray()
+    with path.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+            raw += chunk
+    return raw, h.hexdigest()
+
+
 def read_json_with_etag(path: Path):
+    """Parsed state file and its etag, for read-only handlers.
+
+    The dict is shared with the cache and other readers, so it must not be
+    mutated; handlers that modify state use read_json_for_update instead.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    if not path.exists():
-        return {"version": 1}, sha256_hex(b"")
-    raw = path.read_bytes()
-    return json.loads(raw.decode("utf-8")), sha256_hex(raw)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _json_cache.pop(path, None)
+        return {"version": 1}, etag_hex(b"")
+    cached = _json_cache.get(path)
+    if cached and cached[0] == _stat_key(st):
+        if cached[3] is None:
+            cached = (*cached[:3], _loads_state(cached[1]))
+            _json_cache[path] = cached
+        return cached[3], cached[2]
+    raw, etag = _read_raw(path)
+    data = _loads_state(raw)
+    _json_cache[path] = (_stat_key(st), raw, etag, data)
+    return data, etag
+
+
+def read_json_for_update(path: Path):
+    """Like read_json_with_etag, but the dict is private to the caller.
+
+    Unchanged files are re-parsed from the cached bytes, which is cheaper
+    than a deepcopy of the shared dict.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _json_cache.pop(path, None)
+        return {"version": 1}, etag_hex(b"")
+    cached = _json_cache.get(path)
+    if cached and cached[0] == _stat_key(st):
+        return _loads_state(cached[1]), cached[2]
+    raw, etag = _read_raw(path)
+    # The caller is about to mutate this dict, so only the bytes are cached
+    _json_cache[path] = (_stat_key(st), raw, etag, None)
+    return _loads_state(raw), etag
+
+
+def _current_etag(path: Path) -> str:
+    """Etag of the file's current bytes, for the check under the write lock.
+
+    The stat cache is not trusted here: a same-sized replacement from the CLI
+    that reuses the inode within one mtime tick would look unchanged, and
+    writing over it would lose that update.
+    """
+    try:
+        return etag_hex(path.read_bytes())
+    except FileNotFoundError:
+        return etag_hex(b"")
+
+
+@contextlib.contextmanager
+def _dir_lock(directory: Path):
+    # The same flock on the state directory that scripts/collab_cli.py takes,
+    # so CLI and server writers can't both pass the etag check against one
+    # version. Closing the descriptor releases the lock.
+    if fcntl is None:
+        yield
+        return
+    dfd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        fcntl.flock(dfd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(dfd)
 
 
 def write_json_atomic(path: Path, data: dict, expected_etag: str | None = None) -> dict:
-    current, cur_etag = read_json_with_etag(path)
-    if expected_etag and expected_etag != cur_etag:
-        raise RuntimeError(
-            f"ETag mismatch for {path}: expected {expected_etag}, got {cur_etag}"
-        )
-    tmp = path.with_name(f".{path.name}.tmp")
-    tmp.write_text(
-        json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
-    )
-    os.replace(tmp, path)
-    new, new_etag = read_json_with_etag(path)
-    return {"data": new, "etag": new_etag, "prev_etag": cur_etag}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = _dumps_state(data)
+    with _dir_lock(path.parent):
+        cur_etag = _current_etag(path)
+        if expected_etag and expected_etag != cur_etag:
+            raise RuntimeError(
+                f"ETag mismatch for {path}: expected {expected_etag}, got {cur_etag}"
+            )
+        tmp = path.with_name(f".{path.name}.tmp")
+        # write + fsync(file) + rename + fsync(dir): a crash leaves either the
+        # old or the new file, never a truncated one
+        _write_file_durable(tmp, payload)
+        os.replace(tmp, path)
+        if FSYNC_DIR:
+            _fsync_dir(path.parent)
+        st = path.stat()
+    # The etag is the hash of the bytes just written; no need to read them back.
+    # Callers hand over ownership of `data`, so it is cached as-is for readers.
+    new_etag = etag_hex(payload)
+    _json_cache[path] = (_stat_key(st), payload, new_etag, data)
+    return {"data": data, "etag": new_etag, "prev_etag": cur_etag}
+
+
+# Whole-file etags of the append-only text files (events, log), keyed by path:
+# (st_mtime_ns, st_size, etag)
+_file_etag_cache: dict[Path, tuple[int, int, str]] = {}
+
+
+def _file_etag(path: Path) -> str:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return etag_hex(b"")
+    cached = _file_etag_cache.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    h = _etag_hasher()
+    with path.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    etag = h.hexdigest()
+    _file_etag_cache[path] = (st.st_mtime_ns, st.st_size, etag)
+    return etag
+
+
+def _read_tail(path: Path, since_offset: int, max_bytes: int | None) -> dict:
+    if not path.exists():
+        return {"text": "", "next_offset": 0, "size": 0, "etag": _file_etag(path)}
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        start = min(max(since_offset, 0), size)
+        remaining = size - start
+        limit = remaining if max_bytes is None else min(remaining, max_bytes)
+        f.seek(start)
+        chunk = f.read(limit)
+        if limit < remaining:
+            # Stop at the last complete line so JSONL records are never split;
+            # a line longer than max_bytes is returned whole instead
+            cut = chunk.rfind(b"\n")
+            if cut >= 0:
+                chunk = chunk[: cut + 1]
+            else:
+                chunk += f.readline()
+    return {
+        "text": chunk.decode("utf-8", errors="replace"),
+        "next_offset": start + len(chunk),
+        "size": size,
+        "etag": _file_etag(path),
+    }
+
+
+# Values derived from a state file, rebuilt only when its etag changes:
+# name -> (etag, value)
+_derived_cache: dict[str, tuple[str, object]] = {}
+
+
+def _derived(name: str, etag: str, build):
+    cached = _derived_cache.get(name)
+    if cached and cached[0] == etag:
+        return cached[1]
+    value = build()
+    _derived_cache[name] = (etag, value)
+    return value
+
+
+def _rekey_derived(name: str, old_etag: str, new_etag: str):
+    """Carry a derived value over a write that did not invalidate it."""
+    cached = _derived_cache.get(name)
+    if cached and cached[0] == old_etag:
+        _derived_cache[name] = (new_etag, cached[1])
+
+
+def _build_task_index(tasks: list) -> dict:
+    index = {}
+    for i, t in enumerate(tasks):
+        index.setdefault(t.get("id"), i)
+    return index
+
+
+def _find_task(tasks: list, etag: str, task_id: str) -> dict:
+    index = _derived("task_index", etag, lambda: _build_task_index(tasks))
+    i = index.get(task_id)
+    if i is None:
+        raise RuntimeError("Task not found")
+    return tasks[i]
+
+
+def _build_assignee_load(tasks: list) -> Counter:
+    return Counter(t.get("assignee") for t in tasks if t.get("status") == "in_progress")
+
+
+def _move_assignee_load(old_etag: str, new_etag: str, before: tuple, after: tuple):
+    """Carry the in_progress load over a write that changed one task.
+
+    `before` and `after` are the task's (status, assignee) around the write.
+    """
+    cached = _derived_cache.get("assignee_load")
+    if not cached or cached[0] != old_etag:
+        return
+    load = cached[1]
+    if before[0] == "in_progress":
+        load[before[1]] -= 1
+        if load[before[1]] <= 0:
+            del load[before[1]]
+    if after[0] == "in_progress":
+        load[after[1]] += 1
+    _derived_cache["assignee_load"] = (new_etag, load)
+
+
+def _lease_expiry(lease: dict) -> float | None:
+    """Epoch second after which a lease is stale, or None if unparsable."""
+    acq = lease.get("acquired_at")
+    hb = lease.get("heartbeat_at", acq)
+    try:
+        ttl = int(lease.get("ttl_seconds", TTL_SECONDS))
+        stamps = [
+            datetime.fromisoformat(v.replace("Z", "+00:00")).timestamp()
+            for v in (acq, hb)
+            if v
+        ]
+    except Exception:
+        return None
+    # Stale once either timestamp is older than the ttl
+    return min(stamps) + ttl if stamps else float("inf")
+
+
+def _build_lease_index(locks: list) -> dict:
+    heap = []
+    by_path: dict[str, set] = {}
+    # Ids still present in locks.json that are stale (or unparsable) and
+    # should be dropped by the next successful write
+    expired = set()
+    # Sequence numbers break expiry ties so heap entries never compare ids
+    seq = itertools.count()
+    for lease in locks:
+        lock_id = lease.get("lock_id")
+        expiry = _lease_expiry(lease)
+        if expiry is None:
+            expired.add(lock_id)
+            continue
+        heap.append((expiry, next(seq), lock_id, lease.get("path")))
+        by_path.setdefault(lease.get("path"), set()).add(lock_id)
+    heapq.heapify(heap)
+    return {"heap": heap, "by_path": by_path, "expired": expired, "seq": seq}
+
+
+def _pop_expired_leases(index: dict, now: float) -> set:
+    """Move leases that expired before `now` to the index's expired set."""
+    heap, by_path, expired = index["heap"], index["by_path"], index["expired"]
+    while heap and heap[0][0] < now:
+        _, _, lock_id, path = heapq.heappop(heap)
+        expired.add(lock_id)
+        ids = by_path.get(path)
+        if ids is not None:
+            ids.discard(lock_id)
+            if not ids:
+                del by_path[path]
+    return expired
 
 
 # Schemas (optional validation if jsonschema available)
@@ -101,30 +456,117 @@ def _load_schema(kind: str):
     return None
 
 
-def _validate(kind: str, data: dict):
+@functools.lru_cache(maxsize=8)
+def _get_validator(kind: str):
+    """Compile a state schema once into a validate(data) callable.
+
+    Returns None when there is no schema. fastjsonschema generates Python code
+    for the schema and is used when installed; it only knows drafts 4-7, so a
+    schema it cannot compile falls back to jsonschema.
+    """
     schema = _load_schema(kind)
     if not schema:
-        return
-    try:
-        import jsonschema
+        return None
+    if fastjsonschema is not None:
+        try:
+            return fastjsonschema.compile(schema)
+        except fastjsonschema.JsonSchemaDefinitionException:
+            pass
+    import jsonschema
+
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema).validate
+
 
-        jsonschema.validate(instance=data, schema=schema)
+def _validate(kind: str, data: dict):
+    try:
+        validate = _get_validator(kind)
+        if validate is not None:
+            validate(data)
     except Exception as e:
         raise RuntimeError(f"Schema validation failed for {kind}: {e}")
 
 
+# Long-lived append handle for the event log and the path it was opened for
+_events_fh = None
+_events_fh_path: Path | None = None
+
+
+def _events_replaced(fh) -> bool:
+    # A git pull or checkout swaps events.jsonl under the running server; the
+    # same dev/ino check as logging's WatchedFileHandler catches that
+    try:
+        st = os.stat(EVENTS)
+    except FileNotFoundError:
+        return True
+    fst = os.fstat(fh.fileno())
+    return (st.st_dev, st.st_ino) != (fst.st_dev, fst.st_ino)
+
+
+def _events_handle():
+    global _events_fh, _events_fh_path
+    if (
+        _events_fh is None
+        or _events_fh.closed
+        or _events_fh_path != EVENTS
+        or _events_replaced(_events_fh)
+    ):
+        _close_events()
+        EVENTS_DIR.mkdir(parents=True, exist_ok=True)
+        _events_fh = EVENTS.open("a", encoding="utf-8", buffering=1 << 16)
+        _events_fh_path = EVENTS
+    return _events_fh
+
+
+def _close_events():
+    if _events_fh is not None and not _events_fh.closed:
+        _events_fh.flush()
+        os.fsync(_events_fh.fileno())
+        _events_fh.close()
+
+
+atexit.register(_close_events)
+
+
 def emit_event(ev: dict):
-    EVENTS_DIR.mkdir(parents=True, exist_ok=True)
     ev = {**ev}
     ev.setdefault("ts", now_iso())
-    with EVENTS.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(ev, ensure_ascii=False) + "\n")
+    f = _events_handle()
+    f.write(json.dumps(ev, ensure_ascii=False) + "\n")
+    if EVENT_DURABILITY in ("flush", "fsync"):
+        f.flush()
+        if EVENT_DURABILITY == "fsync":
+            os.fsync(f.fileno())
 
 
 srv = JSONRPCServer()
 
+# Guards the state files, their caches and the event log: read-only handlers
+# share it, mutating handlers take it exclusively (one writer at a time).
+_state_lock = RWLock()
+
+
+def _reads(fn):
+    @functools.wraps(fn)
+    def wrapper(params):
+        with _state_lock.read():
+            return fn(params)
+
+    return wrapper
+
+
+def _writes(fn):
+    @functools.wraps(fn)
+    def wrapper(params):
+        with _state_lock.write():
+            return fn(params)
+
+    return wrapper
+
 
 @srv.method("collab.get_state")
+@_reads
 def get_state(params):
     kind = params.get("kind")
     path_map = {
@@ -138,14 +580,23 @@ def get_state(params):
         raise ValueError("kind must be one of tasks|locks|agents|events|log")
     p = path_map[kind]
     if kind in ("events", "log"):
+        if kind == "events" and _events_fh is not None and not _events_fh.closed:
+            _events_fh.flush()
+        since_offset = params.get("since_offset")
+        max_bytes = params.get("max_bytes")
+        if max_bytes is not None and (type(max_bytes) is not int or max_bytes <= 0):
+            raise ValueError("max_bytes must be a positive integer")
+        if since_offset is not None or max_bytes is not None:
+            # Incremental read: callers pass back next_offset to tail the file
+            return _read_tail(p, int(since_offset or 0), max_bytes)
         text = p.read_text(encoding="utf-8") if p.exists() else ""
-        etag = sha256_hex(text.encode("utf-8"))
-        return {"text": text, "etag": etag}
+        return {"text": text, "etag": _file_etag(p)}
     data, etag = read_json_with_etag(p)
     return {"data": data, "etag": etag}
 
 
 @srv.method("collab.list_tasks")
+@_reads
 def list_tasks(params):
     data, _ = read_json_with_etag(TASKS)
     tasks = data.get("tasks", [])
@@ -159,14 +610,17 @@ def list_tasks(params):
 
 
 @srv.method("collab.create_task")
+@_writes
 def create_task(params):
     title = params["title"]
     description = params.get("description", "")
     labels = params.get("labels", [])
     priority = params.get("priority")
     assignee = params.get("assignee")
-    data, etag = read_json_with_etag(TASKS)
+    data, etag = read_json_for_update(TASKS)
     tasks = data.get("tasks", [])
+    # One timestamp per request: task fields and the emitted event agree
+    ts = now_iso()
     new_id = params.get("id") or f"task-{len(tasks) + 1:03d}"
     task = {
         "id": new_id,
@@ -179,115 +633,152 @@ def create_task(params):
         "dependencies": [],
         "blockers": [],
         "branch": None,
-        "created_at": now_iso(),
-        "updated_at": now_iso(),
+        "created_at": ts,
+        "updated_at": ts,
         "dod": [],
         "needs": None,
     }
+    # Same layout as link_external, so bulk importers can create and link in
+    # one write: {provider: {key: value}}
+    external_ids = params.get("external_ids")
+    if external_ids:
+        task["external_ids"] = external_ids
+    index = _derived("task_index", etag, lambda: _build_task_index(tasks))
     tasks.append(task)
     new_data = {"version": data.get("version", 1), "tasks": tasks}
     _validate("tasks", new_data)
     result = write_json_atomic(TASKS, new_data, expected_etag=etag)
-    emit_event(
-        {
-            "event": "task_created",
-            "task": new_id,
-            "prev_etag": result["prev_etag"],
-            "new_etag": result["etag"],
-        }
-    )
+    index.setdefault(new_id, len(tasks) - 1)
+    _rekey_derived("task_index", etag, result["etag"])
+    _move_assignee_load(etag, result["etag"], (None, None), (task["status"], assignee))
+    event = {
+        "event": "task_created",
+        "ts": ts,
+        "task": new_id,
+        "prev_etag": result["prev_etag"],
+        "new_etag": result["etag"],
+    }
+    if external_ids:
+        event["external_ids"] = external_ids
+    emit_event(event)
     return {"id": new_id}
 
 
 @srv.method("collab.update_task")
+@_writes
 def update_task(params):
     task_id = params["id"]
     fields = {k: v for k, v in params.items() if k != "id"}
-    data, etag = read_json_with_etag(TASKS)
+    data, etag = read_json_for_update(TASKS)
+    return _update_task_in_data(data, etag, task_id, fields)
+
+
+def _update_task_in_data(data: dict, etag: str, task_id: str, fields: dict) -> dict:
+    """Apply `fields` to a task in already-loaded tasks data and write it once."""
     tasks = data.get("tasks", [])
-    for t in tasks:
-        if t.get("id") == task_id:
-            if "status" in fields and fields["status"] not in ALLOWED_STATUSES:
-                raise RuntimeError("Invalid status")
-            t.update(fields)
-            t["updated_at"] = now_iso()
-            new_data = {"version": data.get("version", 1), "tasks": tasks}
-            _validate("tasks", new_data)
-            result = write_json_atomic(TASKS, new_data, expected_etag=etag)
-            emit_event(
-                {
-                    "event": "task_updated",
-                    "task": task_id,
-                    "prev_etag": result["prev_etag"],
-                    "new_etag": result["etag"],
-                }
-            )
-            return {"ok": True}
-    raise RuntimeError("Task not found")
+    t = _find_task(tasks, etag, task_id)
+    if "status" in fields and fields["status"] not in ALLOWED_STATUSES:
+        raise RuntimeError("Invalid status")
+    before = (t.get("status"), t.get("assignee"))
+    t.update(fields)
+    ts = now_iso()
+    t["updated_at"] = ts
+    new_data = {"version": data.get("version", 1), "tasks": tasks}
+    _validate("tasks", new_data)
+    result = write_json_atomic(TASKS, new_data, expected_etag=etag)
+    _rekey_derived("task_index", etag, result["etag"])
+    after = (t.get("status"), t.get("assignee"))
+    _move_assignee_load(etag, result["etag"], before, after)
+    emit_event(
+        {
+            "event": "task_updated",
+            "ts": ts,
+            "task": task_id,
+            "prev_etag": result["prev_etag"],
+            "new_etag": result["etag"],
+        }
+    )
+    return {"ok": True}
 
 
 @srv.method("collab.transition_task")
+@_writes
 def transition_task(params):
     task_id = params["id"]
     new_status = params["new_status"]
     reason = params.get("reason")
     if new_status not in ALLOWED_STATUSES:
         raise RuntimeError("Invalid status")
-    data, etag = read_json_with_etag(TASKS)
+    data, etag = read_json_for_update(TASKS)
     tasks = data.get("tasks", [])
-    for t in tasks:
-        if t.get("id") == task_id:
-            old_status = t.get("status")
-            allowed = ALLOWED_TRANSITIONS.get(old_status, [])
-            if new_status not in allowed:
-                raise RuntimeError(f"Invalid transition {old_status} -> {new_status}")
-            t["status"] = new_status
-            t["updated_at"] = now_iso()
-            new_data = {"version": data.get("version", 1), "tasks": tasks}
-            _validate("tasks", new_data)
-            result = write_json_atomic(TASKS, new_data, expected_etag=etag)
-            emit_event(
-                {
-                    "event": "status_changed",
-                    "task": task_id,
-                    "old_status": old_status,
-                    "new_status": new_status,
-                    "reason": reason,
-                    "prev_etag": result["prev_etag"],
-                    "new_etag": result["etag"],
-                }
-            )
-            return {"ok": True}
-    raise RuntimeError("Task not found")
+    t = _find_task(tasks, etag, task_id)
+    old_status = t.get("status")
+    allowed = ALLOWED_TRANSITIONS.get(old_status, [])
+    if new_status not in allowed:
+        raise RuntimeError(f"Invalid transition {old_status} -> {new_status}")
+    t["status"] = new_status
+    ts = now_iso()
+    t["updated_at"] = ts
+    new_data = {"version": data.get("version", 1), "tasks": tasks}
+    _validate("tasks", new_data)
+    result = write_json_atomic(TASKS, new_data, expected_etag=etag)
+    _rekey_derived("task_index", etag, result["etag"])
+    assignee = t.get("assignee")
+    _move_assignee_load(
+        etag, result["etag"], (old_status, assignee), (new_status, assignee)
+    )
+    emit_event(
+        {
+            "event": "status_changed",
+            "ts": ts,
+            "task": task_id,
+            "old_status": old_status,
+            "new_status": new_status,
+            "reason": reason,
+            "prev_etag": result["prev_etag"],
+            "new_etag": result["etag"],
+        }
+    )
+    return {"ok": True}
 
 
 @srv.method("collab.suggest_assignee")
+@_reads
 def suggest_assignee(params):
-    labels = set(params.get("labels", []))
-    data_tasks, _ = read_json_with_etag(TASKS)
+    data_tasks, tasks_etag = read_json_with_etag(TASKS)
     data_agents, _ = read_json_with_etag(AGENTS)
-    backend_pool = ["codex-cli-1", "codex-cli-2"]
-    frontend_pool = ["cursor-ide", "cursor-ide-2"]
-    docs_pool = ["gemini-cli-1"]
-    if {"backend", "devops", "ci"} & labels:
-        pool = backend_pool
-    elif {"frontend", "e2e"} & labels:
-        pool = frontend_pool
-    elif {"docs", "review"} & labels:
-        pool = docs_pool
-    else:
-        pool = backend_pool + frontend_pool
-    load = {a["id"]: 0 for a in data_agents.get("agents", []) if a.get("id") in pool}
-    for t in data_tasks.get("tasks", []):
-        if t.get("status") == "in_progress" and t.get("assignee") in load:
-            load[t["assignee"]] += 1
-    if not load:
-        return {"assignee": None}
-    assignee = sorted(load.items(), key=lambda kv: kv[1])[0][0]
+    assignee = _suggest_assignee_from_data(
+        params.get("labels", []), data_tasks, tasks_etag, data_agents
+    )
     return {"assignee": assignee}
 
 
+def _suggest_assignee_from_data(
+    labels, data_tasks: dict, tasks_etag: str, data_agents: dict
+) -> str | None:
+    pool = next(
+        (pool for keys, pool in _POOL_RULES if not keys.isdisjoint(labels)),
+        DEFAULT_POOL,
+    )
+    # in_progress task count per assignee, kept current across our own writes
+    in_progress = _derived(
+        "assignee_load",
+        tasks_etag,
+        lambda: _build_assignee_load(data_tasks.get("tasks", [])),
+    )
+    load = {
+        a["id"]: in_progress[a["id"]]
+        for a in data_agents.get("agents", [])
+        if a.get("id") in pool
+    }
+    if not load:
+        return None
+    # min() keeps the first least-loaded agent, matching the old stable sort
+    return min(load.items(), key=lambda kv: kv[1])[0]
+
+
 @srv.method("collab.auto_assign")
+@_writes
 def auto_assign(params):
     """
     Auto-suggest an assignee based on labels and set it on the task.
@@ -295,25 +786,26 @@ def auto_assign(params):
     """
     task_id = params["id"]
     labels = params.get("labels")
+    # Tasks are read once and shared by the label lookup, the suggestion and
+    # the update, so the whole operation is one read and one write
+    data, etag = read_json_for_update(TASKS)
     # If labels not provided, read them from the task
     if labels is None:
-        data, _ = read_json_with_etag(TASKS)
-        for t in data.get("tasks", []):
-            if t.get("id") == task_id:
-                labels = t.get("labels", [])
-                break
-        if labels is None:
+        try:
+            labels = _find_task(data.get("tasks", []), etag, task_id).get("labels", [])
+        except RuntimeError:
             labels = []
-    sug = suggest_assignee({"labels": labels})
-    assignee = sug.get("assignee")
+    data_agents, _ = read_json_with_etag(AGENTS)
+    assignee = _suggest_assignee_from_data(labels, data, etag, data_agents)
     if not assignee:
         return {"assignee": None, "updated": False}
     # Update the task's assignee
-    update_task({"id": task_id, "assignee": assignee})
+    _update_task_in_data(data, etag, task_id, {"assignee": assignee})
     return {"assignee": assignee, "updated": True}
 
 
 @srv.method("collab.link_external")
+@_writes
 def link_external(params):
     """
     Link an external reference to a task.
@@ -324,82 +816,85 @@ def link_external(params):
     provider = params["provider"]
     key = params.get("key", "id")
     value = params["value"]
-    data, etag = read_json_with_etag(TASKS)
+    data, etag = read_json_for_update(TASKS)
     tasks = data.get("tasks", [])
-    for t in tasks:
-        if t.get("id") == task_id:
-            ext = t.get("external_ids") or {}
-            prov = ext.get(provider) or {}
-            prov[key] = value
-            ext[provider] = prov
-            t["external_ids"] = ext
-            t["updated_at"] = now_iso()
-            new_data = {"version": data.get("version", 1), "tasks": tasks}
-            _validate("tasks", new_data)
-            result = write_json_atomic(TASKS, new_data, expected_etag=etag)
-            emit_event(
-                {
-                    "event": "task_linked",
-                    "task": task_id,
-                    "provider": provider,
-                    "key": key,
-                    "value": value,
-                    "prev_etag": result["prev_etag"],
-                    "new_etag": result["etag"],
-                }
-            )
-            return {"ok": True}
-    raise RuntimeError("Task not found")
+    t = _find_task(tasks, etag, task_id)
+    ext = t.get("external_ids") or {}
+    prov = ext.get(provider) or {}
+    prov[key] = value
+    ext[provider] = prov
+    t["external_ids"] = ext
+    ts = now_iso()
+    t["updated_at"] = ts
+    new_data = {"version": data.get("version", 1), "tasks": tasks}
+    _validate("tasks", new_data)
+    result = write_json_atomic(TASKS, new_data, expected_etag=etag)
+    _rekey_derived("task_index", etag, result["etag"])
+    _rekey_derived("assignee_load", etag, result["etag"])
+    emit_event(
+        {
+            "event": "task_linked",
+            "ts": ts,
+            "task": task_id,
+            "provider": provider,
+            "key": key,
+            "value": value,
+            "prev_etag": result["prev_etag"],
+            "new_etag": result["etag"],
+        }
+    )
+    return {"ok": True}
 
 
 @srv.method("collab.emit_event")
+@_writes
 def rpc_emit_event(params):
     emit_event(params)
     return {"ok": True}
 
 
 @srv.method("collab.acquire_lease")
+@_writes
 def rpc_acquire_lease(params):
     path = params["path"]
     owner = params["owner"]
     purpose = params.get("purpose", "")
-    data, etag = read_json_with_etag(LOCKS)
+    data, etag = read_json_for_update(LOCKS)
     locks = data.get("locks", [])
-    # prune stale
-    now = datetime.now(timezone.utc)
-    fresh = []
-    for lease in locks:
-        acq = lease.get("acquired_at")
-        hb = lease.get("heartbeat_at", acq)
-        ttl = int(lease.get("ttl_seconds", TTL_SECONDS))
-        try:
-            acq_t = datetime.fromisoformat(acq.replace("Z", "+00:00")) if acq else now
-            hb_t = datetime.fromisoformat(hb.replace("Z", "+00:00")) if hb else now
-        except Exception:
-            continue
-        if (now - acq_t).total_seconds() <= ttl and (now - hb_t).total_seconds() <= ttl:
-            fresh.append(lease)
-    locks = fresh
-    for lease in locks:
-        if lease["path"] == path:
-            raise RuntimeError(f"Active lease exists for {path}: {lease['lock_id']}")
-    lock_id = f"L-{hashlib.sha1((path + owner + now_iso()).encode()).hexdigest()[:8]}"
+    # prune stale: expiries live in a heap cached per locks.json etag, so only
+    # leases that actually expired are touched instead of reparsing every one
+    index = _derived("lease_index", etag, lambda: _build_lease_index(locks))
+    expired = _pop_expired_leases(index, time.time())
+    if expired:
+        locks = [lease for lease in locks if lease.get("lock_id") not in expired]
+    active = index["by_path"].get(path)
+    if active:
+        raise RuntimeError(f"Active lease exists for {path}: {min(active)}")
+    ts = now_iso()
+    # Lock ids are opaque tokens; random bytes avoid hashing per acquisition
+    lock_id = f"L-{secrets.token_hex(4)}"
     new_lease = {
         "path": path,
         "owner": owner,
         "purpose": purpose,
         "lock_id": lock_id,
-        "acquired_at": now_iso(),
+        "acquired_at": ts,
         "ttl_seconds": TTL_SECONDS,
-        "heartbeat_at": now_iso(),
+        "heartbeat_at": ts,
     }
     locks.append(new_lease)
     new_data = {"version": 1, "locks": locks}
     _validate("locks", new_data)
     result = write_json_atomic(LOCKS, new_data, expected_etag=etag)
+    index["expired"] = set()
+    entry = (_lease_expiry(new_lease), next(index["seq"]), lock_id, path)
+    heapq.heappush(index["heap"], entry)
+    index["by_path"].setdefault(path, set()).add(lock_id)
+    _rekey_derived("lease_index", etag, result["etag"])
     emit_event(
         {
             "event": "file_locked",
+            "ts": ts,
             "path": path,
             "lock_id": lock_id,
             "owner": owner,
@@ -412,10 +907,11 @@ def rpc_acquire_lease(params):
 
 
 @srv.method("collab.release_lease")
+@_writes
 def rpc_release_lease(params):
     lock_id = params["lock_id"]
     owner = params["owner"]
-    data, etag = read_json_with_etag(LOCKS)
+    data, etag = read_json_for_update(LOCKS)
     before = len(data.get("locks", []))
     data["locks"] = [
         lock
@@ -439,6 +935,7 @@ def rpc_release_lease(params):
 
 
 @srv.method("collab.generate_log")
+@_writes
 def rpc_generate_log(params):
     # Simple log: dump tasks by id and last events
     from scripts.generate_collab_log import main as gen
@@ -449,16 +946,18 @@ def rpc_generate_log(params):
 
 
 @srv.method("collab.list_agents")
+@_reads
 def rpc_list_agents(params):
     data, _ = read_json_with_etag(AGENTS)
     return data
 
 
 @srv.method("collab.update_agent")
+@_writes
 def rpc_update_agent(params):
     agent_id = params["id"]
     fields = {k: v for k, v in params.items() if k != "id"}
-    data, etag = read_json_with_etag(AGENTS)
+    data, etag = read_json_for_update(AGENTS)
     agents = data.get("agents", [])
     found = False
     for a in agents:
@@ -483,6 +982,8 @@ def rpc_update_agent(params):
 
 
 def main():
+    # Turn SIGTERM into a normal exit so buffered events are flushed by atexit
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
     srv.serve()
 
 
@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from mcp.base_jsonrpc import JSONRPCServer
 from mcp.env import load_dotenvs
 
 load_dotenvs()
 
+# Read once at import; the server process doesn't see later env changes
+LINEAR_API_TOKEN = os.getenv("LINEAR_API_TOKEN")
+
 srv = JSONRPCServer()
 
+# One pooled keep-alive session so repeated calls reuse TLS connections.
+# Retry keeps urllib3's default allowed_methods, so the issueCreate
+# POST is only retried on connection errors and never sent twice.
+_session = requests.Session()
+_session.headers.update({"Content-Type": "application/json"})
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504)
+        ),
+    ),
+)
+
 
 @srv.method("linear.capabilities")
 def capabilities(params):
-    ok = bool(os.getenv("LINEAR_API_TOKEN"))
+    ok = bool(LINEAR_API_TOKEN)
     return {"configured": ok, "endpoints": ["create_issue"]}
 
 
@@ -22,7 +43,7 @@ def create_issue(params):
     Required params: team_id, title; optional: description, label_ids[]
     Env: LINEAR_API_TOKEN
     """
-    token = os.getenv("LINEAR_API_TOKEN")
+    token = LINEAR_API_TOKEN
     if not token:
         # Fallback stub when not configured
         return {
@@ -39,7 +60,7 @@ def create_issue(params):
         raise ValueError("team_id and title are required")
 
     url = "https://api.linear.app/graphql"
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    headers = {"Authorization": f"Bearer {token}"}
     mutation = """
       mutation IssueCreate($input: IssueCreateInput!) {
         issueCreate(input: $input) { success issue { id identifier url } }
@@ -53,7 +74,7 @@ def create_issue(params):
             **({"labelIds": label_ids} if label_ids else {}),
         }
     }
-    resp = requests.post(
+    resp = _session.post(
         url,
         headers=headers,
         json={"query": mutation, "variables": variables},
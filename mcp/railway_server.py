@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from mcp.base_jsonrpc import JSONRPCServer
 from mcp.env import load_dotenvs
 
 load_dotenvs()
 
+# Read once at import; the server process doesn't see later env changes
+RAILWAY_TOKEN = os.getenv("RAILWAY_TOKEN")
+
 srv = JSONRPCServer()
 
+# One pooled keep-alive session so repeated calls reuse TLS connections.
+# Retry keeps urllib3's default allowed_methods, so the GraphQL POST
+# is only retried on connection errors.
+_session = requests.Session()
+_session.headers.update({"Content-Type": "application/json"})
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504)
+        ),
+    ),
+)
+
 
 @srv.method("railway.capabilities")
 def capabilities(params):
-    ok = bool(os.getenv("RAILWAY_TOKEN"))
+    ok = bool(RAILWAY_TOKEN)
     return {"configured": ok, "endpoints": ["get_deployment"]}
 
 
@@ -20,16 +41,16 @@ def get_deployment(params):
     dep_id = params.get("deployment_id")
     if not dep_id:
         raise ValueError("deployment_id is required")
-    token = os.getenv("RAILWAY_TOKEN")
+    token = RAILWAY_TOKEN
     if not token:
         return {"deployment_id": dep_id, "status": "UNKNOWN", "stub": True}
     url = "https://backboard.railway.app/graphql"
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    headers = {"Authorization": f"Bearer {token}"}
     query = """
       query Deployment($id: String!) { deployment(id: $id) { id status url createdAt } }
     """
     variables = {"id": dep_id}
-    resp = requests.post(
+    resp = _session.post(
         url, headers=headers, json={"query": query, "variables": variables}, timeout=30
     )
     resp.raise_for_status()
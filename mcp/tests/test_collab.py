@@ -3,6 +3,8 @@ import shutil
 import tempfile
 from pathlib import Path
 
+import pytest
+
 
 def test_create_and_transition_task():
     tmp = tempfile.mkdtemp()
@@ -55,3 +57,189 @@ def test_lease_acquire_release():
         assert ok["ok"] is True
     finally:
         shutil.rmtree(tmp)
+
+
+def test_read_json_cache_invalidates_on_change(tmp_path):
+    import importlib
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    path = tmp_path / "tasks.json"
+    path.write_text('{"version": 1, "tasks": []}')
+    first, etag1 = mod.read_json_with_etag(path)
+    # Readers share the cached dict; writers get a private copy
+    again, etag2 = mod.read_json_with_etag(path)
+    assert again is first
+    assert etag1 == etag2
+    private, etag_w = mod.read_json_for_update(path)
+    private["tasks"].append({"id": "x"})
+    assert private is not first and etag_w == etag1
+    assert mod.read_json_with_etag(path)[0] == {"version": 1, "tasks": []}
+    path.write_text('{"version": 1, "tasks": [{"id": "task-001"}]}')
+    changed, etag3 = mod.read_json_with_etag(path)
+    assert changed["tasks"] == [{"id": "task-001"}]
+    assert etag3 != etag1
+
+
+def test_write_json_atomic_etag_matches_file(tmp_path):
+    import importlib
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    path = tmp_path / "locks.json"
+    res = mod.write_json_atomic(path, {"version": 1, "locks": []})
+    assert res["etag"] == mod.etag_hex(path.read_bytes())
+    data, etag = mod.read_json_with_etag(path)
+    assert etag == res["etag"]
+    assert data == {"version": 1, "locks": []}
+
+
+def test_task_lookup_by_id(tmp_path, monkeypatch):
+    import importlib
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    monkeypatch.setattr(mod, "TASKS", tmp_path / "tasks.json")
+    monkeypatch.setattr(mod, "EVENTS_DIR", tmp_path / "events")
+    monkeypatch.setattr(mod, "EVENTS", tmp_path / "events" / "events.jsonl")
+    ids = [mod.create_task({"title": f"T{i}"})["id"] for i in range(3)]
+    mod.update_task({"id": ids[1], "priority": "high"})
+    mod.link_external({"id": ids[2], "provider": "linear", "value": "LIN-1"})
+    tasks = {t["id"]: t for t in mod.list_tasks({})["tasks"]}
+    assert tasks[ids[1]]["priority"] == "high"
+    assert tasks[ids[2]]["external_ids"] == {"linear": {"id": "LIN-1"}}
+    with pytest.raises(RuntimeError, match="Task not found"):
+        mod.update_task({"id": "missing", "priority": "low"})
+
+
+def test_get_state_tails_events(tmp_path, monkeypatch):
+    import importlib
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    monkeypatch.setattr(mod, "EVENTS_DIR", tmp_path)
+    monkeypatch.setattr(mod, "EVENTS", tmp_path / "events.jsonl")
+    for i in range(3):
+        mod.emit_event({"event": "ping", "n": i, "ts": "2025-01-01T00:00:00Z"})
+    full = mod.get_state({"kind": "events"})
+    first = mod.get_state({"kind": "events", "since_offset": 0, "max_bytes": 60})
+    assert first["text"].count("\n") == 1
+    assert first["etag"] == full["etag"]
+    rest = mod.get_state({"kind": "events", "since_offset": first["next_offset"]})
+    assert first["text"] + rest["text"] == full["text"]
+    assert rest["next_offset"] == rest["size"]
+
+
+def test_get_state_tail_never_splits_a_line(tmp_path, monkeypatch):
+    import importlib
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    monkeypatch.setattr(mod, "EVENTS_DIR", tmp_path)
+    monkeypatch.setattr(mod, "EVENTS", tmp_path / "events.jsonl")
+    mod.emit_event({"event": "ping", "note": "é" * 40, "ts": "2025-01-01T00:00:00Z"})
+    mod.emit_event({"event": "pong", "ts": "2025-01-01T00:00:00Z"})
+    first = mod.get_state({"kind": "events", "since_offset": 0, "max_bytes": 30})
+    assert first["text"].count("\n") == 1 and first["text"].endswith("\n")
+    assert "\ufffd" not in first["text"]
+    for bad in ("100", 0, -1, True):
+        with pytest.raises(ValueError, match="max_bytes"):
+            mod.get_state({"kind": "events", "max_bytes": bad})
+
+
+def test_lease_prunes_stale_and_blocks_active(tmp_path, monkeypatch):
+    import importlib
+    import json
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    locks_path = tmp_path / "locks.json"
+    monkeypatch.setattr(mod, "LOCKS", locks_path)
+    monkeypatch.setattr(mod, "EVENTS_DIR", tmp_path)
+    monkeypatch.setattr(mod, "EVENTS", tmp_path / "events.jsonl")
+    stale = {
+        "path": "a.py",
+        "owner": "old",
+        "lock_id": "L-stale",
+        "acquired_at": "2020-01-01T00:00:00Z",
+        "ttl_seconds": 60,
+    }
+    locks_path.write_text(json.dumps({"version": 1, "locks": [stale]}))
+    lid = mod.rpc_acquire_lease({"path": "a.py", "owner": "new"})["lock_id"]
+    ids = [lease["lock_id"] for lease in json.loads(locks_path.read_text())["locks"]]
+    assert ids == [lid]
+    with pytest.raises(RuntimeError, match="Active lease exists"):
+        mod.rpc_acquire_lease({"path": "a.py", "owner": "other"})
+    mod.rpc_release_lease({"lock_id": lid, "owner": "new"})
+    assert mod.rpc_acquire_lease({"path": "a.py", "owner": "other"})["lock_id"]
+
+
+def test_suggest_assignee_tracks_in_progress_load(tmp_path, monkeypatch):
+    import importlib
+    import json
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    monkeypatch.setattr(mod, "TASKS", tmp_path / "tasks.json")
+    monkeypatch.setattr(mod, "AGENTS", tmp_path / "agents.json")
+    monkeypatch.setattr(mod, "EVENTS_DIR", tmp_path)
+    monkeypatch.setattr(mod, "EVENTS", tmp_path / "events.jsonl")
+    agents = [{"id": "codex-cli-1"}, {"id": "codex-cli-2"}]
+    (tmp_path / "agents.json").write_text(json.dumps({"version": 1, "agents": agents}))
+    labels = {"labels": ["backend"]}
+    tid = mod.create_task({"title": "A", "assignee": "codex-cli-1"})["id"]
+    mod.suggest_assignee(labels)
+    mod.transition_task({"id": tid, "new_status": "in_progress"})
+    assert mod.suggest_assignee(labels)["assignee"] == "codex-cli-2"
+    mod.update_task({"id": tid, "assignee": "codex-cli-2"})
+    assert mod.suggest_assignee(labels)["assignee"] == "codex-cli-1"
+    _, etag = mod.read_json_with_etag(mod.TASKS)
+    tasks = mod.list_tasks({})["tasks"]
+    assert mod._derived_cache["assignee_load"] == (
+        etag,
+        mod._build_assignee_load(tasks),
+    )
+
+
+def test_auto_assign_uses_task_labels(tmp_path, monkeypatch):
+    import importlib
+    import json
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    monkeypatch.setattr(mod, "TASKS", tmp_path / "tasks.json")
+    monkeypatch.setattr(mod, "AGENTS", tmp_path / "agents.json")
+    monkeypatch.setattr(mod, "EVENTS_DIR", tmp_path)
+    monkeypatch.setattr(mod, "EVENTS", tmp_path / "events.jsonl")
+    agents = [{"id": "gemini-cli-1"}, {"id": "codex-cli-1"}]
+    (tmp_path / "agents.json").write_text(json.dumps({"version": 1, "agents": agents}))
+    tid = mod.create_task({"title": "Docs", "labels": ["docs"]})["id"]
+    res = mod.auto_assign({"id": tid})
+    assert res == {"assignee": "gemini-cli-1", "updated": True}
+    assert mod.list_tasks({})["tasks"][0]["assignee"] == "gemini-cli-1"
+
+
+def test_create_task_with_external_ids(tmp_path, monkeypatch):
+    import importlib
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    monkeypatch.setattr(mod, "TASKS", tmp_path / "tasks.json")
+    monkeypatch.setattr(mod, "EVENTS_DIR", tmp_path)
+    monkeypatch.setattr(mod, "EVENTS", tmp_path / "events.jsonl")
+    ext = {"github": {"pr": "42"}}
+    tid = mod.create_task({"title": "CR", "external_ids": ext})["id"]
+    assert mod.list_tasks({})["tasks"][0]["external_ids"] == ext
+    mod.link_external({"id": tid, "provider": "linear", "value": "LIN-1"})
+    task = mod.list_tasks({})["tasks"][0]
+    assert task["external_ids"] == {"github": {"pr": "42"}, "linear": {"id": "LIN-1"}}
+
+
+def test_emit_event_reopens_replaced_events_file(tmp_path, monkeypatch):
+    import importlib
+    import json
+
+    mod = importlib.import_module("mcp.kyros_collab_server")
+    events = tmp_path / "events.jsonl"
+    monkeypatch.setattr(mod, "EVENTS_DIR", tmp_path)
+    monkeypatch.setattr(mod, "EVENTS", events)
+    mod.emit_event({"event": "a"})
+    mod._events_handle().flush()
+    # What a checkout does: a new file renamed over the old one
+    (tmp_path / "new.jsonl").write_bytes(events.read_bytes())
+    (tmp_path / "new.jsonl").replace(events)
+    mod.emit_event({"event": "b"})
+    mod._events_handle().flush()
+    lines = events.read_text().splitlines()
+    assert [json.loads(line)["event"] for line in lines] == ["a", "b"]
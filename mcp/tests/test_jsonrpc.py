@@ -0,0 +1,49 @@
+import io
+import json
+import sys
+
+from mcp.base_jsonrpc import JSONRPCServer
+
+
+def test_worker_pool_answers_every_request(monkeypatch):
+    srv = JSONRPCServer(workers=4)
+
+    @srv.method("echo")
+    def echo(params):
+        return params
+
+    @srv.method("boom")
+    def boom(params):
+        raise RuntimeError("boom")
+
+    lines = [
+        json.dumps({"jsonrpc": "2.0", "id": i, "method": "echo", "params": {"n": i}})
+        for i in range(20)
+    ]
+    lines.append(json.dumps({"jsonrpc": "2.0", "id": "x", "method": "boom"}))
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join(lines) + "\n"))
+    monkeypatch.setattr(sys, "stdout", out)
+    srv.serve()
+    replies = {r["id"]: r for r in map(json.loads, out.getvalue().splitlines())}
+    assert len(replies) == 21
+    assert all(replies[i]["result"] == {"n": i} for i in range(20))
+    assert replies["x"]["error"]["message"] == "boom"
+
+
+def test_unserializable_result_gets_error_reply(monkeypatch):
+    for workers in (0, 2):
+        srv = JSONRPCServer(workers=workers)
+
+        @srv.method("sets")
+        def sets(params):
+            return {"x": {1, 2}}
+
+        line = json.dumps({"jsonrpc": "2.0", "id": 7, "method": "sets"})
+        out = io.StringIO()
+        monkeypatch.setattr(sys, "stdin", io.StringIO(line + "\n"))
+        monkeypatch.setattr(sys, "stdout", out)
+        srv.serve()
+        (reply,) = map(json.loads, out.getvalue().splitlines())
+        assert reply["id"] == 7
+        assert reply["error"]["code"] == -32603
@@ -0,0 +1,44 @@
+import threading
+
+import pytest
+
+from mcp.rwlock import RWLock
+
+
+def test_readers_share_and_writer_excludes():
+    lock = RWLock()
+    inside = threading.Event()
+    release = threading.Event()
+
+    def reader():
+        with lock.read():
+            inside.set()
+            release.wait(2)
+
+    t = threading.Thread(target=reader)
+    t.start()
+    assert inside.wait(2)
+    # A second reader is admitted while the first still holds the lock
+    with lock.read():
+        pass
+    wrote = threading.Event()
+
+    def writer():
+        with lock.write():
+            wrote.set()
+
+    w = threading.Thread(target=writer)
+    w.start()
+    assert not wrote.wait(0.1)
+    release.set()
+    t.join(2)
+    w.join(2)
+    assert wrote.is_set()
+
+
+def test_writer_reenters_and_upgrade_is_refused():
+    lock = RWLock()
+    with lock.write(), lock.read(), lock.write():
+        pass
+    with lock.read(), pytest.raises(RuntimeError), lock.write():
+        pass
@@ -1,23 +1,43 @@
 #!/usr/bin/env python3
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from mcp.base_jsonrpc import JSONRPCServer
 from mcp.env import load_dotenvs
 
 load_dotenvs()
 
+# Read once at import; the server process doesn't see later env changes
+VERCEL_TOKEN = os.getenv("VERCEL_TOKEN")
+
 srv = JSONRPCServer()
 
+# One pooled keep-alive session so repeated calls reuse TLS connections.
+# Retry keeps urllib3's default allowed_methods, so GETs are retried on
+# transient failures.
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504)
+        ),
+    ),
+)
+
 
 @srv.method("vercel.get_deployment")
 def get_deployment(params):
     dep = params.get("deployment_id")
-    token = os.getenv("VERCEL_TOKEN")
+    token = VERCEL_TOKEN
     if not token:
         return {"deployment_id": dep, "state": "UNKNOWN", "stub": True}
     url = f"https://api.vercel.com/v13/deployments/{dep}"
     headers = {"Authorization": f"Bearer {token}"}
-    resp = requests.get(url, headers=headers, timeout=20)
+    resp = _session.get(url, headers=headers, timeout=20)
     resp.raise_for_status()
     data = resp.json()
     return {"deployment_id": dep, "state": data.get("state"), "url": data.get("url")}
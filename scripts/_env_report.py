@@ -0,0 +1,26 @@
+"""
+Shared output helpers for the test-env-*.py environment check scripts.
+"""
+
+
+def mask(value: str) -> str:
+    """Show only the ends of a secret (or *** when it is too short)."""
+    return value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
+
+
+def is_sensitive(name: str, words) -> bool:
+    lname = name.lower()
+    return any(w in lname for w in words)
+
+
+def print_var(name: str, value, sensitive: bool, icon: str, missing: str) -> bool:
+    """Print one report line for a variable and return whether it is set.
+
+    Set values get a ✅ line (masked when sensitive); unset ones get
+    "<icon> NAME: <missing>".
+    """
+    if value:
+        print(f"  ✅ {name}: {mask(value) if sensitive else value}")
+        return True
+    print(f"  {icon} {name}: {missing}")
+    return False
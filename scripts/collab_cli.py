@@ -4,11 +4,17 @@ Collaboration helper CLI: ETag-based atomic writes, leases, and events.
 
 Usage examples:
   python scripts/collab_cli.py emit-event '{"event":"tests_run","task":"task-001","result":"pass"}'
+  some-tool | python scripts/collab_cli.py emit-event --batch   # one JSON object per line
   python scripts/collab_cli.py acquire-lease frontend/playwright.config.js codex-cli task-004
   python scripts/collab_cli.py renew-lease <lock_id> codex-cli
   python scripts/collab_cli.py release-lease <lock_id> codex-cli
   python scripts/collab_cli.py generate-log
 
+  # Long-running mode: keep caches warm and serve commands over a Unix socket
+  python scripts/collab_cli.py serve --socket /tmp/collab.sock &
+  COLLAB_SOCKET=/tmp/collab.sock python scripts/collab_cli.py list-tasks
+  echo '{"argv": ["list-tasks"]}' | nc -U /tmp/collab.sock   # any client works
+
   # Tasks management
   python scripts/collab_cli.py list-tasks --status in_progress
   python scripts/collab_cli.py create-task --title "Add healthcheck" --labels backend,ci --priority P2 --assignee thomas [--roadmap-id R2.1.1]
@@ -17,16 +23,28 @@ Usage examples:
 """
 
 import argparse
+import contextlib
 import hashlib
+import io
 import json
 import os
+import signal
 import sys
 import time
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
 from typing import List
-import yaml
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json produces the same layout
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks (Windows): writes stay etag-checked only
+    fcntl = None
 
 BASE = Path("collaboration")
 STATE = BASE / "state"
@@ -37,6 +55,10 @@ TASKS = STATE / "tasks.json"
 
 TTL_SECONDS = 900
 HEARTBEAT_SECONDS = 300
+# Same switches as the collab MCP server: fsync the new state file and its
+# directory around the rename unless disabled
+FSYNC_FILE = os.getenv("COLLAB_FSYNC_FILE", "1").lower() not in ("0", "false", "no")
+FSYNC_DIR = os.getenv("COLLAB_FSYNC_DIR", "1").lower() not in ("0", "false", "no")
 
 # Task lifecycle
 ALLOWED_STATUSES = [
@@ -53,7 +75,10 @@ ALLOWED_STATUSES = [
     "abandoned",
 ]
 
-ALLOWED_TRANSITIONS = {
+# Set form for O(1) membership checks; the list keeps argparse help ordered
+_STATUS_SET = frozenset(ALLOWED_STATUSES)
+
+_TRANSITIONS = {
     "queued": ["claimed", "in_progress", "abandoned"],
     "claimed": ["in_progress", "blocked", "abandoned"],
     "in_progress": ["review", "blocked", "failed"],
@@ -66,38 +91,154 @@ ALLOWED_TRANSITIONS = {
     "abandoned": [],
     "done": [],
 }
+ALLOWED_TRANSITIONS = {k: frozenset(v) for k, v in _TRANSITIONS.items()}
+
+
+def utcnow_iso(t: float | None = None) -> str:
+    """UTC timestamp as YYYY-MM-DDTHH:MM:SSZ for `t` (default: now)."""
+    g = time.gmtime(t)
+    return (
+        f"{g.tm_year:04d}-{g.tm_mon:02d}-{g.tm_mday:02d}"
+        f"T{g.tm_hour:02d}:{g.tm_min:02d}:{g.tm_sec:02d}Z"
+    )
+
+
+def etag_hex(data: bytes) -> str:
+    # ETags only detect concurrent modification, so BLAKE2b-128 (faster than
+    # sha256, still in hashlib) is plenty. The collab MCP server hashes the
+    # same way, so etags from either writer compare equal.
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _dumps_state(data: dict) -> bytes:
+    """Serialize a state document as 2-space indented UTF-8 JSON + newline."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
 
+def _loads_state(raw: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
 
-def utcnow_iso():
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
+# Raw state files keyed by path: (stat key, bytes, etag). Only filled in
+# `serve` mode: a one-shot command reads each file once, so caching there
+# would only add work
+_STATE_CACHE: dict[Path, tuple[tuple[int, int, int], bytes, str]] = {}
+_CACHE_STATE = False
 
-def sha256_hex(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+
+def _stat_key(st: os.stat_result) -> tuple[int, int, int]:
+    # Writers replace the file, so the inode changes on every write; mtime and
+    # size alone can repeat when two same-sized writes land in one clock tick
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
 
 
 def read_json_with_etag(path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
-    if not path.exists():
-        return {}, sha256_hex(b"")
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _STATE_CACHE.pop(path, None)
+        return {}, etag_hex(b"")
+    cached = _STATE_CACHE.get(path)
+    if cached and cached[0] == _stat_key(st):
+        # Callers mutate the returned dict, so each gets its own parse of the
+        # cached bytes (cheaper than a deepcopy of a shared dict)
+        return _loads_state(cached[1]), cached[2]
     raw = path.read_bytes()
-    etag = sha256_hex(raw)
-    return json.loads(raw.decode("utf-8")), etag
+    etag = etag_hex(raw)
+    if _CACHE_STATE:
+        _STATE_CACHE[path] = (_stat_key(st), raw, etag)
+    return _loads_state(raw), etag
+
+
+# Open descriptors of state directories, so temp-file creation and the rename
+# use names relative to the directory instead of resolving full paths
+_DIR_FDS: dict[Path, int] = {}
+# (os.replace shares renameat with os.rename but is not listed on its own)
+_USE_DIR_FD = os.open in os.supports_dir_fd and os.rename in os.supports_dir_fd
+
+
+def _dir_fd(directory: Path) -> int:
+    dfd = _DIR_FDS.get(directory)
+    if dfd is None:
+        dfd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        _DIR_FDS[directory] = dfd
+    return dfd
+
+
+def _replace_with_payload(path: Path, payload: bytes):
+    tmp_name = f".{path.name}.tmp-{uuid.uuid4().hex}"
+    if not _USE_DIR_FD:
+        temp = path.with_name(tmp_name)
+        temp.write_bytes(payload)
+        os.replace(temp, path)
+        return
+    dfd = _dir_fd(path.parent)
+    fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644, dir_fd=dfd)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+        if FSYNC_FILE:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_name, path.name, src_dir_fd=dfd, dst_dir_fd=dfd)
+    if FSYNC_DIR:
+        os.fsync(dfd)
+
+
+def _current_etag(path: Path) -> str:
+    """Etag of the file's current bytes.
+
+    Always hashed rather than taken from the stat cache: another writer can
+    reuse the inode with a same-sized file within one mtime tick, and a false
+    cache hit here would let this write silently drop theirs.
+    """
+    try:
+        return etag_hex(path.read_bytes())
+    except FileNotFoundError:
+        return etag_hex(b"")
+
+
+@contextlib.contextmanager
+def _dir_lock(directory: Path):
+    # flock on the directory rather than the file: os.replace swaps the file's
+    # inode, so a lock held on it would not exclude the next writer
+    if fcntl is None or not _USE_DIR_FD:
+        yield
+        return
+    dfd = _dir_fd(directory)
+    fcntl.flock(dfd, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(dfd, fcntl.LOCK_UN)
 
 
 def write_json_atomic(path: Path, data: dict, expected_etag: str | None = None) -> str:
-    current, cur_etag = read_json_with_etag(path)
-    if expected_etag and expected_etag != cur_etag:
-        raise RuntimeError(
-            f"ETag mismatch for {path}: expected {expected_etag}, got {cur_etag}"
-        )
-    temp = path.with_name(f".{path.name}.tmp-{uuid.uuid4().hex}")
-    temp.write_text(
-        json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
-    )
-    os.replace(temp, path)
-    # return new etag
-    return read_json_with_etag(path)[1]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = _dumps_state(data)
+    # The check and the replace happen under one lock, which the collab MCP
+    # server takes as well, so no two writers pass the check on one version
+    with _dir_lock(path.parent):
+        cur_etag = _current_etag(path)
+        if expected_etag and expected_etag != cur_etag:
+            raise RuntimeError(
+                f"ETag mismatch for {path}: expected {expected_etag}, got {cur_etag}"
+            )
+        _STATE_CACHE.pop(path, None)
+        _replace_with_payload(path, payload)
+        st = path.stat()
+    # return new etag: the hash of the bytes just written, no re-read needed
+    new_etag = etag_hex(payload)
+    if _CACHE_STATE:
+        _STATE_CACHE[path] = (_stat_key(st), payload, new_etag)
+    return new_etag
 
 
 # ---------------------------
@@ -105,8 +246,20 @@ def write_json_atomic(path: Path, data: dict, expected_etag: str | None = None)
 # ---------------------------
 
 def _load_tasks():
+    """Return (version, tasks, etag, index) where index maps task id -> position."""
     data, etag = read_json_with_etag(TASKS)
-    return data.get("version", 1), data.get("tasks", []), etag
+    tasks = data.get("tasks", [])
+    index = {}
+    for i, t in enumerate(tasks):
+        index.setdefault(t.get("id"), i)
+    return data.get("version", 1), tasks, etag, index
+
+
+def _find_task(tasks: List[dict], index: dict, task_id: str) -> dict:
+    i = index.get(task_id)
+    if i is None:
+        raise RuntimeError("Task not found")
+    return tasks[i]
 
 
 def _save_tasks(version: int, tasks: List[dict], etag: str) -> str:
@@ -115,11 +268,15 @@ def _save_tasks(version: int, tasks: List[dict], etag: str) -> str:
 
 
 def list_tasks_cli(status: str | None, assignee: str | None, output: str):
-    version, tasks, _ = _load_tasks()
-    if status:
-        tasks = [t for t in tasks if t.get("status") == status]
-    if assignee:
-        tasks = [t for t in tasks if t.get("assignee") == assignee]
+    version, tasks, _, _ = _load_tasks()
+    # Both filters in one pass (empty values mean "no filter", as before)
+    if status or assignee:
+        tasks = [
+            t
+            for t in tasks
+            if (not status or t.get("status") == status)
+            and (not assignee or t.get("assignee") == assignee)
+        ]
     if output == "json":
         print(json.dumps({"version": version, "tasks": tasks}, indent=2))
         return
@@ -133,8 +290,9 @@ def list_tasks_cli(status: str | None, assignee: str | None, output: str):
 
 
 def create_task_cli(title: str, description: str, labels: List[str], priority: str | None, assignee: str | None, id_override: str | None):
-    version, tasks, etag = _load_tasks()
+    version, tasks, etag, _ = _load_tasks()
     new_id = id_override or f"task-{len(tasks) + 1:03d}"
+    ts = utcnow_iso()
     task = {
         "id": new_id,
         "title": title,
@@ -146,14 +304,14 @@ def create_task_cli(title: str, description: str, labels: List[str], priority: s
         "dependencies": [],
         "blockers": [],
         "branch": None,
-        "created_at": utcnow_iso(),
-        "updated_at": utcnow_iso(),
+        "created_at": ts,
+        "updated_at": ts,
         "dod": [],
         "needs": None,
     }
     tasks.append(task)
     _save_tasks(version, tasks, etag)
-    emit_event({"event": "task_created", "task": new_id})
+    emit_event({"event": "task_created", "task": new_id, "ts": ts})
     print(new_id)
 
 
@@ -161,60 +319,80 @@ def _link_task_to_roadmap(roadmap_id: str, task_id: str):
     rp = Path("project/roadmap.yml")
     if not rp.exists():
         raise RuntimeError("project/roadmap.yml not found; cannot link task to roadmap")
-    doc = yaml.safe_load(rp.read_text(encoding="utf-8")) or {}
-
-    def find(n: dict, rid: str):
-        if n.get("id") == rid:
-            return n
-        for c in n.get("children", []) or []:
-            got = find(c, rid)
-            if got:
-                return got
-        return None
+    # PyYAML is imported here rather than at module level: it is by far the
+    # slowest import and only roadmap linking needs it
+    import yaml
+
+    # libyaml-backed loader/dumper when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    doc = yaml.load(rp.read_text(encoding="utf-8"), Loader=loader) or {}
 
+    # Iterative pre-order search; same match order as a recursive DFS
     target = None
-    for root in (doc.get("nodes") or []):
-        target = find(root, roadmap_id)
-        if target:
+    stack = list(reversed(doc.get("nodes") or []))
+    while stack:
+        node = stack.pop()
+        if node.get("id") == roadmap_id:
+            target = node
             break
+        stack.extend(reversed(node.get("children") or []))
     if not target:
         raise RuntimeError(f"Roadmap id not found: {roadmap_id}")
     links = target.get("links") or {}
     links["task_id"] = task_id
     target["links"] = links
-    rp.write_text(yaml.safe_dump(doc, sort_keys=False), encoding="utf-8")
+    rp.write_text(
+        yaml.dump(doc, Dumper=dumper, sort_keys=False), encoding="utf-8"
+    )
 
 
 def update_task_cli(task_id: str, fields: dict):
-    version, tasks, etag = _load_tasks()
-    for t in tasks:
-        if t.get("id") == task_id:
-            if "status" in fields and fields["status"] not in ALLOWED_STATUSES:
-                raise RuntimeError("Invalid status")
-            t.update({k: v for k, v in fields.items() if v is not None})
-            t["updated_at"] = utcnow_iso()
-            _save_tasks(version, tasks, etag)
-            emit_event({"event": "task_updated", "task": task_id})
-            return
-    raise RuntimeError("Task not found")
+    version, tasks, etag, index = _load_tasks()
+    t = _find_task(tasks, index, task_id)
+    if "status" in fields and fields["status"] not in _STATUS_SET:
+        raise RuntimeError("Invalid status")
+    t.update({k: v for k, v in fields.items() if v is not None})
+    t["updated_at"] = utcnow_iso()
+    _save_tasks(version, tasks, etag)
+    emit_event({"event": "task_updated", "task": task_id})
 
 
 def transition_task_cli(task_id: str, new_status: str):
-    if new_status not in ALLOWED_STATUSES:
+    if new_status not in _STATUS_SET:
         raise RuntimeError("Invalid status")
-    version, tasks, etag = _load_tasks()
-    for t in tasks:
-        if t.get("id") == task_id:
-            old = t.get("status")
-            allowed = ALLOWED_TRANSITIONS.get(old, [])
-            if new_status not in allowed:
-                raise RuntimeError(f"Invalid transition {old} -> {new_status}")
-            t["status"] = new_status
-            t["updated_at"] = utcnow_iso()
-            _save_tasks(version, tasks, etag)
-            emit_event({"event": "status_changed", "task": task_id, "old_status": old, "new_status": new_status})
-            return
-    raise RuntimeError("Task not found")
+    version, tasks, etag, index = _load_tasks()
+    t = _find_task(tasks, index, task_id)
+    old = t.get("status")
+    allowed = ALLOWED_TRANSITIONS.get(old, frozenset())
+    if new_status not in allowed:
+        raise RuntimeError(f"Invalid transition {old} -> {new_status}")
+    t["status"] = new_status
+    t["updated_at"] = utcnow_iso()
+    _save_tasks(version, tasks, etag)
+    emit_event({"event": "status_changed", "task": task_id, "old_status": old, "new_status": new_status})
+
+
+# Legacy kind/action events -> (event name, fixed fields, copied fields as
+# (new key, legacy key, default), default actor)
+_LEGACY_EVENTS = {
+    ("task", "in_progress"): (
+        "status_changed",
+        {"old_status": "queued", "new_status": "in_progress"},
+        (),
+        "unknown",
+    ),
+    ("pr", "opened"): (
+        "pr_opened",
+        {},
+        (("pr", "pr_number", None), ("url", "url", "")),
+        "unknown",
+    ),
+    ("test", "completed"): ("tests_run", {}, (("status", "result", "unknown"),), "ci"),
+    ("review", "requested"): ("review_requested", {}, (), "ci"),
+    ("review", "approved"): ("approved", {}, (), "critic"),
+    ("merge", "completed"): ("merged", {}, (), "integrator"),
+}
 
 
 def normalize_event_format(event: dict) -> dict:
@@ -225,108 +403,130 @@ def normalize_event_format(event: dict) -> dict:
     # If it already has an 'event' field, it's already in the new format
     if "event" in event:
         return event
-    
+
     # Convert old format to new format
-    kind = event.get("kind")
-    action = event.get("action")
-    task = event.get("task")
-    
-    if kind == "task" and action == "in_progress":
-        return {
-            "event": "status_changed",
-            "task": task,
-            "old_status": "queued",
-            "new_status": "in_progress",
-            "actor": event.get("actor", "unknown"),
-            "notes": event.get("message", ""),
-            "ts": event.get("ts", utcnow_iso())
-        }
-    elif kind == "pr" and action == "opened":
-        return {
-            "event": "pr_opened",
-            "task": task,
-            "pr": event.get("pr_number"),
-            "url": event.get("url", ""),
-            "actor": event.get("actor", "unknown"),
-            "notes": event.get("message", ""),
-            "ts": event.get("ts", utcnow_iso())
-        }
-    elif kind == "test" and action == "completed":
-        return {
-            "event": "tests_run",
-            "task": task,
-            "status": event.get("result", "unknown"),
-            "actor": event.get("actor", "ci"),
-            "notes": event.get("message", ""),
-            "ts": event.get("ts", utcnow_iso())
-        }
-    elif kind == "review" and action == "requested":
-        return {
-            "event": "review_requested",
-            "task": task,
-            "actor": event.get("actor", "ci"),
-            "notes": event.get("message", ""),
-            "ts": event.get("ts", utcnow_iso())
-        }
-    elif kind == "review" and action == "approved":
-        return {
-            "event": "approved",
-            "task": task,
-            "actor": event.get("actor", "critic"),
-            "notes": event.get("message", ""),
-            "ts": event.get("ts", utcnow_iso())
-        }
-    elif kind == "merge" and action == "completed":
-        return {
-            "event": "merged",
-            "task": task,
-            "actor": event.get("actor", "integrator"),
-            "notes": event.get("message", ""),
-            "ts": event.get("ts", utcnow_iso())
-        }
-    
-    # If we can't map it, return as-is but add a warning
-    print(f"Warning: Unknown event format: {event}", file=sys.stderr)
-    return event
+    spec = _LEGACY_EVENTS.get((event.get("kind"), event.get("action")))
+    if spec is None:
+        # If we can't map it, return as-is but add a warning
+        print(f"Warning: Unknown event format: {event}", file=sys.stderr)
+        return event
+
+    name, fixed, copied, actor = spec
+    out = {"event": name, "task": event.get("task"), **fixed}
+    for key, legacy_key, default in copied:
+        out[key] = event.get(legacy_key, default)
+    out["actor"] = event.get("actor", actor)
+    out["notes"] = event.get("message", "")
+    out["ts"] = event["ts"] if "ts" in event else utcnow_iso()
+    return out
+
+
+# O_APPEND descriptor for EVENTS, opened on first use and kept for the process
+_events_fd: int | None = None
+
+
+def _events_file_replaced(fd: int) -> bool:
+    """Whether EVENTS no longer names the file open on fd (removed or replaced)."""
+    try:
+        st = os.stat(EVENTS)
+    except FileNotFoundError:
+        return True
+    fst = os.fstat(fd)
+    return (st.st_dev, st.st_ino) != (fst.st_dev, fst.st_ino)
+
+
+def _append_events(data: bytes):
+    global _events_fd
+    # events.jsonl is tracked in git, so a pull or checkout under a `serve`
+    # daemon swaps the file; reopen then, as logging's WatchedFileHandler does
+    if _events_fd is not None and _events_file_replaced(_events_fd):
+        os.close(_events_fd)
+        _events_fd = None
+    if _events_fd is None:
+        EVENTS_DIR.mkdir(parents=True, exist_ok=True)
+        _events_fd = os.open(EVENTS, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    # Regular files take the whole buffer in one write(), and with O_APPEND
+    # each line lands intact at the end even when processes append concurrently
+    view = memoryview(data)
+    while view:
+        view = view[os.write(_events_fd, view) :]
+
+
+def _event_line(event: dict) -> str:
+    # New-format events (the common case) skip the legacy shim entirely
+    if "event" not in event:
+        event = normalize_event_format(event)
+    # Copy only when adding ts, so the caller's dict is never mutated
+    if "ts" not in event:
+        event = {**event, "ts": utcnow_iso()}
+    return json.dumps(event, ensure_ascii=False) + "\n"
 
 
 def emit_event(event: dict):
-    EVENTS_DIR.mkdir(parents=True, exist_ok=True)
-    event = normalize_event_format(event)
-    event = {**event}
-    event.setdefault("ts", utcnow_iso())
-    with EVENTS.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    _append_events(_event_line(event).encode("utf-8"))
+
+
+def emit_events(events) -> int:
+    """Append many events with a single write; returns how many were written."""
+    lines = [_event_line(e) for e in events]
+    if lines:
+        _append_events("".join(lines).encode("utf-8"))
+    return len(lines)
+
+
+def _event_line_from_json(text: str) -> str:
+    text = text.strip()
+    obj = orjson.loads(text) if orjson is not None else json.loads(text)
+    if (
+        isinstance(obj, dict)
+        and "event" in obj
+        and "ts" in obj
+        and "\n" not in text
+        and "\r" not in text
+    ):
+        # Already a complete single-line new-format event: append the text as
+        # given instead of re-serializing the parsed dict
+        return text + "\n"
+    return _event_line(obj)
+
+
+def emit_events_json(texts) -> int:
+    """Like emit_events, but for JSON texts (e.g. CLI args or stdin lines)."""
+    lines = [_event_line_from_json(t) for t in texts if t.strip()]
+    if lines:
+        _append_events("".join(lines).encode("utf-8"))
+    return len(lines)
 
 
 def acquire_lease(path: str, owner: str, purpose: str):
     data, etag = read_json_with_etag(LOCKS)
-    locks = data.get("locks", [])
     now = time.time()
-    # prune stale
-    fresh_locks = []
-    for lease in locks:
-        acquired = _parse_ts(lease.get("acquired_at"))
-        heartbeat = _parse_ts(lease.get("heartbeat_at", lease.get("acquired_at")))
-        if now - acquired > lease.get(
-            "ttl_seconds", TTL_SECONDS
-        ) or now - heartbeat > lease.get("ttl_seconds", TTL_SECONDS):
+    # One pass prunes stale leases (stale once the older timestamp is past the
+    # ttl) and indexes the live ones by path for the duplicate check
+    locks = []
+    active_by_path = {}
+    for lease in data.get("locks", []):
+        if min(_lease_epochs(lease)) + lease.get("ttl_seconds", TTL_SECONDS) < now:
             continue
-        fresh_locks.append(lease)
-    locks = fresh_locks
+        locks.append(lease)
+        active_by_path.setdefault(lease["path"], lease)
     # ensure no active lease for same path
-    for lease in locks:
-        if lease["path"] == path:
-            raise RuntimeError(f"Active lease exists for {path}: {lease['lock_id']}")
+    active = active_by_path.get(path)
+    if active is not None:
+        raise RuntimeError(f"Active lease exists for {path}: {active['lock_id']}")
     lock_id = f"L-{uuid.uuid4().hex[:8]}"
+    # One clock reading for the ISO fields, the epoch fields and the event
+    now_iso = utcnow_iso(now)
     lease = {
         "path": path,
         "owner": owner,
         "purpose": purpose,
         "lock_id": lock_id,
-        "acquired_at": utcnow_iso(),
+        "acquired_at": now_iso,
         "ttl_seconds": TTL_SECONDS,
-        "heartbeat_at": utcnow_iso(),
+        "heartbeat_at": now_iso,
+        "acquired_epoch": int(now),
+        "heartbeat_epoch": int(now),
     }
     locks.append(lease)
     new_etag = write_json_atomic(
@@ -335,6 +535,7 @@ def acquire_lease(path: str, owner: str, purpose: str):
     emit_event(
         {
             "event": "file_locked",
+            "ts": now_iso,
             "path": path,
             "lock_id": lock_id,
             "owner": owner,
@@ -351,7 +552,9 @@ def renew_lease(lock_id: str, owner: str):
     updated = False
     for lease in data.get("locks", []):
         if lease.get("lock_id") == lock_id and lease.get("owner") == owner:
-            lease["heartbeat_at"] = utcnow_iso()
+            now = time.time()
+            lease["heartbeat_at"] = utcnow_iso(now)
+            lease["heartbeat_epoch"] = int(now)
             updated = True
             break
     if not updated:
@@ -396,6 +599,21 @@ def generate_log():
     gen()
 
 
+def _lease_epochs(lease: dict) -> tuple[float, float]:
+    """(acquired, heartbeat) as epoch seconds.
+
+    Uses the numeric *_epoch fields written by this CLI and only parses the
+    ISO timestamps for leases that lack them (older or MCP-created leases).
+    """
+    acquired = lease.get("acquired_epoch")
+    if acquired is None:
+        acquired = _parse_ts(lease.get("acquired_at"))
+    heartbeat = lease.get("heartbeat_epoch")
+    if heartbeat is None:
+        heartbeat = _parse_ts(lease.get("heartbeat_at", lease.get("acquired_at")))
+    return acquired, heartbeat
+
+
 def _parse_ts(ts: str | None) -> float:
     if not ts:
         return 0.0
@@ -405,12 +623,132 @@ def _parse_ts(ts: str | None) -> float:
         return 0.0
 
 
-def main():
+# ---------------------------
+# Daemon mode
+# ---------------------------
+
+def _run_request(req: dict) -> dict:
+    """Run one forwarded command line, capturing what it prints and its exit code."""
+    argv = [str(a) for a in req.get("argv") or []]
+    if argv and argv[0] == "serve":
+        return {"code": 2, "stdout": "", "stderr": "Error: serve cannot be forwarded\n"}
+    out, err = io.StringIO(), io.StringIO()
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(req.get("stdin") or "")
+    code = 0
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                main(argv)
+            except SystemExit as e:
+                # sys.exit(None) means success, sys.exit("msg") failure
+                code = e.code if isinstance(e.code, int) else int(e.code is not None)
+    finally:
+        sys.stdin = stdin
+    return {"code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+def serve(socket_path: str):
+    """Serve one-line JSON requests {"argv": [...], "stdin": "..."} on a Unix socket.
+
+    Each reply is one JSON line {"code", "stdout", "stderr"}. Commands run one
+    at a time on the event loop, so they see the same state a sequence of CLI
+    runs would, while the state-file caches and open fds stay warm. Paths
+    resolve against the directory the daemon was started in.
+    """
+    import asyncio
+
+    global _CACHE_STATE
+    _CACHE_STATE = True
+
+    async def handle(reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    reply = _run_request(json.loads(line))
+                except ValueError as e:
+                    reply = {
+                        "code": 2,
+                        "stdout": "",
+                        "stderr": f"Error: bad request: {e}\n",
+                    }
+                payload = json.dumps(reply, ensure_ascii=False).encode("utf-8")
+                writer.write(payload + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def run():
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        server = await asyncio.start_unix_server(handle, path=socket_path)
+        async with server:
+            await stop.wait()
+
+    try:
+        asyncio.run(run())
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+
+
+def _forward(socket_path: str, argv: List[str]) -> int | None:
+    """Run argv on a `serve` daemon; None when no daemon is listening."""
+    import socket
+
+    req = {"argv": argv}
+    if "--batch" in argv:
+        req["stdin"] = sys.stdin.read()
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+    except OSError:
+        if "stdin" in req:
+            sys.stdin = io.StringIO(req["stdin"])
+        return None
+    with conn, conn.makefile("rb") as f:
+        conn.sendall(json.dumps(req, ensure_ascii=False).encode("utf-8") + b"\n")
+        reply = json.loads(f.readline())
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    return reply.get("code", 1)
+
+
+def main(argv: List[str] | None = None):
+    if argv is None:
+        argv = sys.argv[1:]
+        # COLLAB_SOCKET hands the command to a running `serve` daemon, falling
+        # back to running it here when nothing is listening
+        socket_path = os.environ.get("COLLAB_SOCKET")
+        if socket_path and argv[:1] != ["serve"]:
+            code = _forward(socket_path, argv)
+            if code is not None:
+                sys.exit(code)
+
+    # Fast path for the command automation calls most: a single
+    # `emit-event '<json>'` skips building the argparse tree
+    if len(argv) == 2 and argv[0] == "emit-event" and not argv[1].startswith("-"):
+        try:
+            emit_events_json([argv[1]])
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
     ap = argparse.ArgumentParser()
     sub = ap.add_subparsers(dest="cmd", required=True)
 
     ee = sub.add_parser("emit-event")
-    ee.add_argument("json", help="JSON object as string")
+    ee.add_argument("json", nargs="?", help="JSON object as string")
+    ee.add_argument(
+        "--batch",
+        action="store_true",
+        help="read one JSON object per line from stdin and append them in one write",
+    )
 
     al = sub.add_parser("acquire-lease")
     al.add_argument("path")
@@ -427,6 +765,9 @@ def main():
 
     sub.add_parser("generate-log")
 
+    sv = sub.add_parser("serve", help="serve commands over a Unix socket")
+    sv.add_argument("--socket", required=True, help="Unix socket path to listen on")
+
     # Tasks: list/create/update/transition
     lt = sub.add_parser("list-tasks")
     lt.add_argument("--status", choices=ALLOWED_STATUSES)
@@ -455,11 +796,18 @@ def main():
     tt.add_argument("id")
     tt.add_argument("new_status", choices=ALLOWED_STATUSES)
 
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
+    if args.cmd == "serve":
+        serve(args.socket)
+        return
     try:
         if args.cmd == "emit-event":
-            obj = json.loads(args.json)
-            emit_event(obj)
+            if args.batch:
+                emit_events_json(sys.stdin)
+            elif args.json is None:
+                ap.error("emit-event needs a JSON argument or --batch")
+            else:
+                emit_events_json([args.json])
         elif args.cmd == "acquire-lease":
             acquire_lease(args.path, args.owner, args.purpose)
         elif args.cmd == "renew-lease":
@@ -476,7 +824,7 @@ def main():
             # If roadmap id provided, link it to the last created task id by reading tasks.json
             if args.roadmap_id:
                 try:
-                    _, tasks, _ = _load_tasks()
+                    _, tasks, _, _ = _load_tasks()
                     tid = tasks[-1]["id"] if tasks else None
                     if tid:
                         _link_task_to_roadmap(args.roadmap_id, tid)
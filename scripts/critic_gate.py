@@ -5,12 +5,18 @@ import sys
 from pathlib import Path
 from urllib.request import urlopen, Request
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
 
 def load_tasks(root: Path):
     p = root / "collaboration/state/tasks.json"
     if not p.exists():
         return []
-    data = json.loads(p.read_text(encoding="utf-8"))
+    raw = p.read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     return data.get("tasks", [])
 
 
@@ -16,13 +16,56 @@ Notes:
 
 import os
 import sys
+import time
+import random
 import argparse
 import requests
 
 
-def chunks(s: str, n: int):
-    for i in range(0, len(s), n):
-        yield s[i : i + n]
+def iter_chunks(path: str, n: int):
+    """Yield the file's text n characters at a time; an empty file yields one
+    empty chunk so it still posts a (blank) message."""
+    with open(path, "r", encoding="utf-8") as f:
+        part = f.read(n)
+        yield part
+        while part := f.read(n):
+            yield part
+
+
+# Statuses worth retrying: rate limits, timeouts and transient server errors.
+# Anything else (4xx, 501 Not Implemented, ...) will not change on retry.
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def post_with_backoff(session, url: str, payload: dict, max_retries: int = 5):
+    """POST to a webhook, waiting out 429s for as long as Discord asks and
+    backing off exponentially on other retryable statuses. Other errors raise
+    immediately."""
+    for attempt in range(max_retries + 1):
+        r = session.post(url, json=payload, timeout=15)
+        if attempt == max_retries or r.status_code not in RETRYABLE_STATUSES:
+            break
+        if r.status_code == 429:
+            # Retry-After / retry_after are seconds (may be fractional)
+            retry_after = r.headers.get("Retry-After")
+            if retry_after is None:
+                try:
+                    retry_after = r.json().get("retry_after", 1)
+                except ValueError:
+                    retry_after = 1
+            delay = float(retry_after)
+        else:
+            delay = 2**attempt
+        time.sleep(delay + random.uniform(0, 0.5))
+    r.raise_for_status()
+    # Pace against the webhook's rate-limit bucket (5 posts / 2s): when this
+    # post used the last slot, wait out the reset instead of earning a 429
+    if r.headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            time.sleep(float(r.headers.get("X-RateLimit-Reset-After", 0)))
+        except ValueError:
+            pass
+    return r
 
 
 def main():
@@ -39,8 +82,6 @@ def main():
         print("Error: DISCORD_WEBHOOK_URL not set", file=sys.stderr)
         sys.exit(1)
 
-    text = open(args.file, "r", encoding="utf-8").read()
-
     header_lines = []
     if args.title:
         header_lines.append(f"**{args.title}**")
@@ -56,16 +97,18 @@ def main():
     header = "\n".join(header_lines).strip()
 
     # Discord limit per message ~2000; keep margin for code fences and header
-    body = text
-    blocks = list(chunks(body, 1800)) if len(body) > 1800 else [body]
+    # Read lazily so each chunk is posted before the next one is read
+    blocks = iter_chunks(args.file, 1800)
+    # Chunks go out one at a time so Discord keeps them in order; the session
+    # reuses one keep-alive connection instead of a TLS handshake per chunk
+    session = requests.Session()
     for i, part in enumerate(blocks):
         content_parts = []
         if i == 0 and header:
             content_parts.append(header)
         content_parts.append(f"```\n{part}\n```")
         payload = {"content": "\n".join(content_parts)}
-        r = requests.post(hook, json=payload, timeout=15)
-        r.raise_for_status()
+        post_with_backoff(session, hook, payload)
     print("Posted to Discord")
 
 
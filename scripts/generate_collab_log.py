@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 import json
+import mmap
+import os
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
 EVENTS = Path("collaboration/events/events.jsonl")
 OUT = Path("collaboration/logs/log.md")
 
@@ -12,21 +19,38 @@ def iso(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def load_events(path: Path):
-    items = []
+def iter_events(path: Path):
+    """Yield parsed events from a JSONL file, skipping blank or invalid lines.
+
+    The file is memory-mapped read-only and split on newlines in place, so the
+    OS pages it in as it is walked instead of copying it through buffered
+    readline(). Lines appended while iterating are not seen.
+    """
     if not path.exists():
-        return items
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-                items.append(obj)
-            except json.JSONDecodeError:
-                continue
-    return items
+        return
+    loads = orjson.loads if orjson is not None else json.loads
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos < size:
+                nl = mm.find(b"\n", pos)
+                end = size if nl == -1 else nl
+                line = mm[pos:end].strip()
+                pos = end + 1
+                if not line:
+                    continue
+                try:
+                    event = loads(line)
+                except ValueError:  # JSONDecodeError or undecodable bytes
+                    continue
+                yield event
+
+
+def load_events(path: Path):
+    return list(iter_events(path))
 
 
 def render(tasks):
@@ -36,13 +60,23 @@ def render(tasks):
         latest_status = None
         assignee = None
         branch = None
+        # Summary fields and timeline lines come out of the same pass
+        timeline = []
         for e in evs:
-            if e.get("event") == "status_changed":
+            event = e.get("event", "")
+            if event == "status_changed":
                 latest_status = e.get("new_status")
-            if e.get("assignee"):
-                assignee = e.get("assignee")
-            if e.get("branch"):
-                branch = e.get("branch")
+            who = e.get("assignee")
+            if who:
+                assignee = who
+            ref = e.get("branch")
+            if ref:
+                branch = ref
+            notes = e.get("notes")
+            line = f"- {e.get('ts', '')} {event}"
+            if notes:
+                line += f": {notes}"
+            timeline.append(line)
         lines.append(f"## {task_id}")
         lines.append("")
         if latest_status:
@@ -53,24 +87,16 @@ def render(tasks):
             lines.append(f"- Branch: {branch}")
         lines.append("")
         lines.append("### Timeline")
-        for e in evs:
-            ts = e.get("ts", "")
-            event = e.get("event", "")
-            notes = e.get("notes")
-            line = f"- {ts} {event}"
-            if notes:
-                line += f": {notes}"
-            lines.append(line)
+        lines.extend(timeline)
         lines.append("")
     return "\n".join(lines) + "\n"
 
 
 def main():
-    events = load_events(EVENTS)
+    # Group straight off the parser; the full event list is never built
     grouped = defaultdict(list)
-    for e in events:
-        task = e.get("task", "(none)")
-        grouped[task].append(e)
+    for e in iter_events(EVENTS):
+        grouped[e.get("task", "(none)")].append(e)
 
     OUT.parent.mkdir(parents=True, exist_ok=True)
     OUT.write_text(render(grouped), encoding="utf-8")
@@ -1,30 +1,51 @@
 #!/usr/bin/env python3
+import heapq
 import json
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
 TASKS_PATH = Path("collaboration/state/tasks.json")
 OUT_PATH = Path("collaboration/board.md")
 
+# Board section for each task status; statuses not listed are not shown
+SECTION_BY_STATUS = {
+    "in_progress": "now",
+    "queued": "next",
+    "claimed": "next",
+    "review": "review",
+    "changes_requested": "review",
+    "blocked": "review",
+    "done": "done",
+}
+
 
 def load_tasks():
     if not TASKS_PATH.exists():
         return {"version": 1, "tasks": []}
-    return json.loads(TASKS_PATH.read_text(encoding="utf-8"))
+    # Parse the bytes directly rather than decoding to a str first
+    raw = TASKS_PATH.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _recent_key(t):
+    return t.get("updated_at") or t.get("created_at") or ""
 
 
 def sort_recent(tasks):
-    def key(t):
-        return t.get("updated_at") or t.get("created_at") or ""
-    return sorted(tasks, key=key, reverse=True)
+    return sorted(tasks, key=_recent_key, reverse=True)
 
 
 def render_board(data: dict) -> str:
-    tasks = data.get("tasks", [])
-    now = [t for t in tasks if t.get("status") == "in_progress"]
-    nxt = [t for t in tasks if t.get("status") in ("queued", "claimed")]
-    review = [t for t in tasks if t.get("status") in ("review", "changes_requested", "blocked")]
-    done = [t for t in tasks if t.get("status") == "done"]
+    buckets = {"now": [], "next": [], "review": [], "done": []}
+    for t in data.get("tasks", []):
+        section_key = SECTION_BY_STATUS.get(t.get("status"))
+        if section_key:
+            buckets[section_key].append(t)
 
     lines = []
     lines.append("# Project Board")
@@ -62,10 +83,11 @@ def render_board(data: dict) -> str:
             lines.append(f"- {lid} [{pri}] ({who}) — {title}{badges}")
         lines.append("")
 
-    section("Now", sort_recent(now))
-    section("Next", sort_recent(nxt))
-    section("Review / Blocked", sort_recent(review))
-    section("Done (recent 10)", sort_recent(done)[:10])
+    section("Now", sort_recent(buckets["now"]))
+    section("Next", sort_recent(buckets["next"]))
+    section("Review / Blocked", sort_recent(buckets["review"]))
+    # Same as sort_recent(...)[:10] without sorting the whole done list
+    section("Done (recent 10)", heapq.nlargest(10, buckets["done"], key=_recent_key))
 
     return "\n".join(lines) + "\n"
 
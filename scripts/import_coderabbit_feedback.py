@@ -16,6 +16,25 @@ import yaml
 from pathlib import Path
 from textwrap import shorten
 
+# libyaml-backed loader/dumper when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def link_roadmap_task(rp: Path, roadmap_id: str, tid: str) -> bool:
+    doc = yaml.load(rp.read_text(encoding="utf-8"), Loader=_YAML_LOADER) or {}
+    stack = list(reversed(doc.get("nodes") or []))
+    while stack:
+        n = stack.pop()
+        if n.get("id") == roadmap_id:
+            links = n.get("links") or {}
+            links["task_id"] = tid
+            n["links"] = links
+            rp.write_text(yaml.dump(doc, Dumper=_YAML_DUMPER, sort_keys=False), encoding="utf-8")
+            return True
+        stack.extend(reversed(n.get("children", []) or []))
+    return False
+
 
 def main():
     ap = argparse.ArgumentParser()
@@ -54,48 +73,30 @@ def main():
             labels.append("frontend")
         elif path and path.startswith("backend/"):
             labels.append("backend")
+        # The assignee suggestion and the PR link ride along with the create,
+        # so each suggestion costs one tasks.json write instead of three
+        assignee = collab.suggest_assignee({"labels": labels})["assignee"] if args.assign else None
         res = collab.create_task(
             {
                 "title": shorten(title, width=80, placeholder="…"),
                 "description": description,
                 "labels": labels,
                 "priority": "P2",
+                "assignee": assignee,
+                # Link PR number
+                "external_ids": {"github": {"pr": str(args.pr)}},
             }
         )
         tid = res.get("id")
         if tid:
-            # Link PR number
-            collab.link_external(
-                {"id": tid, "provider": "github", "key": "pr", "value": str(args.pr)}
-            )
-            if args.assign:
-                collab.auto_assign({"id": tid, "labels": labels})
-            # Optionally link to roadmap
-            if args.roadmap_id:
-                try:
-                    rp = Path("project/roadmap.yml")
-                    doc = yaml.safe_load(rp.read_text(encoding="utf-8")) or {}
-                    def find(n, rid):
-                        if n.get("id") == rid:
-                            return n
-                        for c in n.get("children", []) or []:
-                            got = find(c, rid)
-                            if got:
-                                return got
-                        return None
-                    target = None
-                    for root in (doc.get("nodes") or []):
-                        target = find(root, args.roadmap_id)
-                        if target:
-                            break
-                    if target:
-                        links = target.get("links") or {}
-                        links["task_id"] = tid
-                        target["links"] = links
-                        rp.write_text(yaml.safe_dump(doc, sort_keys=False), encoding="utf-8")
-                except Exception:
-                    pass
             created.append(tid)
+    # Optionally link to roadmap. The node holds a single task_id, so linking
+    # each task in turn would leave the last one: link that with one write
+    if args.roadmap_id and created:
+        try:
+            link_roadmap_task(Path("project/roadmap.yml"), args.roadmap_id, created[-1])
+        except Exception:
+            pass
     print(f"Created tasks: {', '.join(created) if created else '(none)'}")
 
 
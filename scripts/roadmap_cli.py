@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 import argparse
+import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import yaml
 
+try:
+    import orjson
+except ImportError:  # optional; only speeds up reading tasks.json
+    orjson = None
+
+# libyaml-backed loader/dumper when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 ROOTMAP = Path("project/roadmap.yml")
 
@@ -13,40 +23,72 @@ ROOTMAP = Path("project/roadmap.yml")
 def load_yaml(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise SystemExit(f"Roadmap file not found: {path}")
-    return yaml.safe_load(path.read_text(encoding="utf-8"))
+    return yaml.load(path.read_text(encoding="utf-8"), Loader=_YAML_LOADER)
 
 
-def save_yaml(path: Path, data: Dict[str, Any]):
-    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+def save_yaml(path: Path, data: Dict[str, Any]) -> bool:
+    """Write the roadmap atomically; returns False (and writes nothing) when the
+    serialized document matches the file already on disk."""
+    after = yaml.dump(data, Dumper=_YAML_DUMPER, sort_keys=False).encode("utf-8")
+    try:
+        if path.read_bytes() == after:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(after)
+    os.replace(tmp, path)
+    return True
 
 
 def find_node(node: Dict[str, Any], node_id: str) -> Optional[Dict[str, Any]]:
-    if node.get("id") == node_id:
-        return node
-    for c in node.get("children", []) or []:
-        got = find_node(c, node_id)
-        if got:
-            return got
+    # Explicit stack instead of recursion; children pushed reversed so the
+    # search stays preorder (first match in document order)
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if n.get("id") == node_id:
+            return n
+        kids = n.get("children")
+        if kids:
+            stack.extend(reversed(kids))
     return None
 
 
 def find_node_and_parent(nodes: list, node_id: str, parent: Optional[Dict[str, Any]] = None):
-    for n in nodes:
-        if n.get("id") == node_id:
-            return n, parent
-        child = find_node(n, node_id)
-        if child:
-            # We need to also find actual direct parent
-            stack = [(n, None)]
-            while stack:
-                cur, par = stack.pop()
-                if cur.get("id") == node_id:
-                    return cur, par
-                for ch in cur.get("children", []) or []:
-                    stack.append((ch, cur))
+    # One preorder walk carrying each node's parent, stopping at the first hit
+    stack = [(n, parent) for n in reversed(nodes)]
+    while stack:
+        cur, par = stack.pop()
+        if cur.get("id") == node_id:
+            return cur, par
+        kids = cur.get("children")
+        if kids:
+            stack.extend((c, cur) for c in reversed(kids))
     return None, None
 
 
+def index_nodes(nodes: list) -> Dict[str, tuple]:
+    """Map every node id to (node, parent) in one walk; parent is None at top level.
+
+    Ids are expected to be unique; if one repeats, the first in document order
+    wins, as with find_node.
+    """
+    index: Dict[str, tuple] = {}
+    stack = [(n, None) for n in reversed(nodes)]
+    while stack:
+        node, parent = stack.pop()
+        index.setdefault(node.get("id"), (node, parent))
+        kids = node.get("children")
+        if kids:
+            stack.extend((c, node) for c in reversed(kids))
+    return index
+
+
+def lookup(doc: Dict[str, Any], node_id: str) -> Optional[Dict[str, Any]]:
+    return index_nodes(doc.get("nodes", []) or []).get(node_id, (None, None))[0]
+
+
 def ensure_links(n: Dict[str, Any]) -> Dict[str, Any]:
     links = n.get("links")
     if links is None:
@@ -56,29 +98,26 @@ def ensure_links(n: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def cmd_set_status(doc: Dict[str, Any], node_id: str, status: str):
-    for n in doc.get("nodes", []) or []:
-        target = find_node(n, node_id)
-        if target:
-            target["status"] = status
-            return True
+    target = lookup(doc, node_id)
+    if target:
+        target["status"] = status
+        return True
     return False
 
 
 def cmd_set_owner(doc: Dict[str, Any], node_id: str, owner: str):
-    for n in doc.get("nodes", []) or []:
-        target = find_node(n, node_id)
-        if target:
-            target["owner"] = owner
-            return True
+    target = lookup(doc, node_id)
+    if target:
+        target["owner"] = owner
+        return True
     return False
 
 
 def cmd_set_title(doc: Dict[str, Any], node_id: str, title: str):
-    for n in doc.get("nodes", []) or []:
-        target = find_node(n, node_id)
-        if target:
-            target["title"] = title
-            return True
+    target = lookup(doc, node_id)
+    if target:
+        target["title"] = title
+        return True
     return False
 
 
@@ -88,11 +127,10 @@ def cmd_add_node(doc: Dict[str, Any], node_id: str, title: str, parent_id: Optio
         new_node["owner"] = owner
     if parent_id:
         # attach under parent
-        for n in doc.get("nodes", []) or []:
-            p = find_node(n, parent_id)
-            if p:
-                p.setdefault("children", []).append(new_node)
-                return True
+        p = lookup(doc, parent_id)
+        if p:
+            p.setdefault("children", []).append(new_node)
+            return True
         return False
     else:
         # top-level
@@ -100,10 +138,21 @@ def cmd_add_node(doc: Dict[str, Any], node_id: str, title: str, parent_id: Optio
         return True
 
 
+def _in_subtree(root: Dict[str, Any], node: Dict[str, Any]) -> bool:
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        if n is node:
+            return True
+        stack.extend(n.get("children") or [])
+    return False
+
+
 def cmd_move_node(doc: Dict[str, Any], node_id: str, new_parent_id: Optional[str]):
     nodes = doc.get("nodes", []) or []
-    # Remove from current parent
-    target, parent = find_node_and_parent(nodes, node_id)
+    # One index serves both the node and its new parent
+    index = index_nodes(nodes)
+    target, parent = index.get(node_id, (None, None))
     if not target:
         return False
     # Remove from existing location
@@ -117,12 +166,12 @@ def cmd_move_node(doc: Dict[str, Any], node_id: str, new_parent_id: Optional[str
 
     remove_from_parent(parent, target)
     if new_parent_id:
-        # attach to new parent
-        for n in nodes:
-            p = find_node(n, new_parent_id)
-            if p:
-                p.setdefault("children", []).append(target)
-                return True
+        # attach to new parent; one inside the moved subtree counts as not
+        # found, since it left the tree along with the node
+        p = index.get(new_parent_id, (None, None))[0]
+        if p is not None and not _in_subtree(target, p):
+            p.setdefault("children", []).append(target)
+            return True
         # if parent not found, put back where it was (end)
         nodes.append(target)
         return False
@@ -133,12 +182,11 @@ def cmd_move_node(doc: Dict[str, Any], node_id: str, new_parent_id: Optional[str
 
 
 def cmd_link_task(doc: Dict[str, Any], node_id: str, task_id: str):
-    for n in doc.get("nodes", []) or []:
-        target = find_node(n, node_id)
-        if target:
-            links = ensure_links(target)
-            links["task_id"] = task_id
-            return True
+    target = lookup(doc, node_id)
+    if target:
+        links = ensure_links(target)
+        links["task_id"] = task_id
+        return True
     return False
 
 
@@ -148,34 +196,43 @@ def cmd_sync_from_task(doc: Dict[str, Any], node_id: str):
     tasks_path = Path("collaboration/state/tasks.json")
     if not tasks_path.exists():
         raise SystemExit("tasks.json not found; cannot sync")
-    tasks = json.loads(tasks_path.read_text(encoding="utf-8")).get("tasks", [])
+    raw = tasks_path.read_bytes()
+    tasks = (orjson.loads(raw) if orjson is not None else json.loads(raw)).get("tasks", [])
     task_map = {t.get("id"): t for t in tasks}
-    for n in doc.get("nodes", []) or []:
-        target = find_node(n, node_id)
-        if target:
-            tid = (target.get("links") or {}).get("task_id")
-            if not tid:
-                raise SystemExit(f"Node {node_id} is not linked to a task")
-            t = task_map.get(tid)
-            if not t:
-                raise SystemExit(f"Linked task not found: {tid}")
-            st = t.get("status", "queued")
-            # Map task status to roadmap status
-            if st in ("done", "approved", "merging"):
-                target["status"] = "done"
-            elif st in ("in_progress", "review", "changes_requested"):
-                target["status"] = "in_progress"
-            elif st == "blocked":
-                target["status"] = "blocked"
-            else:
-                target["status"] = "queued"
-            return True
-    return False
+    target = lookup(doc, node_id)
+    if not target:
+        return False
+    tid = (target.get("links") or {}).get("task_id")
+    if not tid:
+        raise SystemExit(f"Node {node_id} is not linked to a task")
+    t = task_map.get(tid)
+    if not t:
+        raise SystemExit(f"Linked task not found: {tid}")
+    st = t.get("status", "queued")
+    # Map task status to roadmap status
+    if st in ("done", "approved", "merging"):
+        target["status"] = "done"
+    elif st in ("in_progress", "review", "changes_requested"):
+        target["status"] = "in_progress"
+    elif st == "blocked":
+        target["status"] = "blocked"
+    else:
+        target["status"] = "queued"
+    return True
 
 
-def regenerate_markdown():
+def regenerate_markdown(doc: Optional[Dict[str, Any]] = None):
     # Best-effort; keep failure non-fatal
     try:
+        # Render the document already in memory instead of starting a second
+        # interpreter that re-imports PyYAML and re-parses the file
+        import roadmap_tree
+    except ImportError:
+        roadmap_tree = None
+    try:
+        if roadmap_tree is not None and doc is not None:
+            roadmap_tree.render_to_file(doc, Path("ROADMAP.md"))
+            return
         import subprocess
 
         subprocess.run(
@@ -241,8 +298,10 @@ def main():
     if not ok:
         raise SystemExit("Operation failed (id not found or invalid parent)")
 
-    save_yaml(ROOTMAP, doc)
-    regenerate_markdown()
+    if not save_yaml(ROOTMAP, doc):
+        print("Roadmap already up to date; nothing written")
+        return
+    regenerate_markdown(doc)
     print("Updated roadmap and regenerated ROADMAP.md")
 
 
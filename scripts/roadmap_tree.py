@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 import sys
+import functools
 import yaml
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, Tuple
+
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 STATUS_ORDER = {
@@ -13,110 +17,131 @@ STATUS_ORDER = {
     "blocked": -1,
 }
 
+STATUS_BADGE = {
+    "done": "[x]",
+    "approved": "[x]",
+    "in_progress": "[~]",
+    "blocked": "[!]",
+    "queued": "[ ]",
+}
+
 
 def load(path: Path) -> Dict:
-    return yaml.safe_load(path.read_text(encoding="utf-8"))
+    return yaml.load(path.read_text(encoding="utf-8"), Loader=_YAML_LOADER)
+
+
+def precount(node: Dict, memo: Dict[int, Tuple[int, int]]) -> Tuple[int, int]:
+    # One post-order pass records (done, total) for every subtree, keyed by
+    # id(node), so rendering looks counts up instead of re-walking subtrees
+    stack = [(node, False)]
+    while stack:
+        n, kids_counted = stack.pop()
+        kids = n.get("children", []) or []
+        if not kids_counted:
+            stack.append((n, True))
+            stack.extend((c, False) for c in kids)
+            continue
+        total = 1
+        done = 1 if n.get("status") == "done" else 0
+        for c in kids:
+            d, t = memo[id(c)]
+            done += d
+            total += t
+        memo[id(n)] = (done, total)
+    return memo[id(node)]
 
 
 def count(node: Dict) -> Tuple[int, int]:
-    total = 1
-    done = 1 if node.get("status") == "done" else 0
-    for c in node.get("children", []) or []:
-        d, t = count(c)
-        done += d
-        total += t
-    return done, total
+    return precount(node, {})
 
 
+@functools.lru_cache(maxsize=16)
 def status_badge(s: str) -> str:
-    s = (s or "queued").lower()
-    m = {
-        "done": "[x]",
-        "approved": "[x]",
-        "in_progress": "[~]",
-        "blocked": "[!]",
-        "queued": "[ ]",
-    }
-    return m.get(s, "[ ]")
-
-
-def render_node(node: Dict, prefix: str = "") -> List[str]:
-    lines: List[str] = []
-    d, t = count(node)
-    badge = status_badge(node.get("status"))
-    owner = f" @{node.get('owner')}" if node.get("owner") else ""
-    title = f"{badge} {node.get('id', '')} — {node.get('title','')} ({d}/{t}){owner}"
-    lines.append(prefix + title)
-
-    kids = node.get("children", []) or []
-    # stable order: done at bottom, then in_progress, then queued; keep declaration order for equal statuses
-    kids_sorted = sorted(
-        list(enumerate(kids)),
-        key=lambda kv: STATUS_ORDER.get(kv[1].get("status", "queued"), 0),
-        reverse=True,
-    )
-    last_idx = kids_sorted[-1][0] if kids_sorted else -1
-    for idx, child in kids_sorted:
-        is_last = idx == last_idx
-        branch = "└─ " if is_last else "├─ "
-        child_prefix = prefix + branch
-        # For child children, indent with spacer
-        sub_indent = prefix + ("   " if is_last else "│  ")
-        lines.extend(render_node_lines(child, child_prefix, sub_indent))
-    return lines
-
-
-def render_node_lines(node: Dict, line_prefix: str, child_prefix: str) -> List[str]:
-    # Render this node, then its children with child_prefix
-    lines: List[str] = []
-    d, t = count(node)
-    badge = status_badge(node.get("status"))
-    owner = f" @{node.get('owner')}" if node.get("owner") else ""
-    title = f"{badge} {node.get('id','')} — {node.get('title','')} ({d}/{t}){owner}"
-    lines.append(line_prefix + title)
-    kids = node.get("children", []) or []
-    for i, k in enumerate(kids):
-        last = i == len(kids) - 1
-        branch = "└─ " if last else "├─ "
-        lp = child_prefix + branch
-        cp = child_prefix + ("   " if last else "│  ")
-        lines.extend(render_node_lines(k, lp, cp))
-    return lines
-
-
-def render(doc: Dict) -> str:
+    return STATUS_BADGE.get((s or "queued").lower(), "[ ]")
+
+
+def render_node_lines(
+    node: Dict,
+    line_prefix: str,
+    child_prefix: str,
+    memo: Dict[int, Tuple[int, int]],
+    sort_kids: bool = False,
+) -> Iterator[str]:
+    # Yield this node's line, then its children's with child_prefix. Walks
+    # with an explicit stack so deep roadmaps can't hit the recursion limit.
+    stack = [(node, line_prefix, child_prefix, sort_kids)]
+    while stack:
+        node, line_prefix, child_prefix, sort_kids = stack.pop()
+        d, t = memo[id(node)]
+        badge = status_badge(node.get("status"))
+        owner = node.get("owner")
+        owner_str = f" @{owner}" if owner else ""
+        yield f"{line_prefix}{badge} {node.get('id','')} — {node.get('title','')} ({d}/{t}){owner_str}"
+        kids = node.get("children", []) or []
+        if sort_kids:
+            # top level only: order children by status, keeping declaration order
+            # for equal statuses. Ranks are computed once per child and the
+            # index breaks ties, so the sort never compares the dicts.
+            rank = STATUS_ORDER.get
+            kids = [k for _, _, k in sorted((-rank(k.get("status", "queued"), 0), i, k) for i, k in enumerate(kids))]
+        last_i = len(kids) - 1
+        # pushed in reverse so they pop in display order
+        for i in range(last_i, -1, -1):
+            last = i == last_i
+            lp = child_prefix + ("└─ " if last else "├─ ")
+            cp = child_prefix + ("   " if last else "│  ")
+            stack.append((kids[i], lp, cp, False))
+
+
+def render_lines(doc: Dict) -> Iterator[str]:
     title = doc.get("title", "Roadmap")
     nodes = doc.get("nodes", []) or []
     goals = doc.get("goals", []) or []
-    # header + summary
-    total = sum(count(n)[1] for n in nodes)
-    done = sum(count(n)[0] for n in nodes)
+    memo: Dict[int, Tuple[int, int]] = {}
+    # header + summary, totalled in the same pass that fills the memo
+    done = total = 0
+    for n in nodes:
+        d, t = precount(n, memo)
+        done += d
+        total += t
     pct = int(round((done / total) * 100)) if total else 0
-    lines = [f"# {title}", "", f"Progress: {done}/{total} ({pct}%)", ""]
+    yield f"# {title}"
+    yield ""
+    yield f"Progress: {done}/{total} ({pct}%)"
+    yield ""
     # Human-only goals section
     if goals:
-        lines.append("## Goals")
-        lines.append("")
+        yield "## Goals"
+        yield ""
         for g in goals:
             gid = g.get("id", "")
             title = g.get("title", "")
-            lines.append(f"- {gid} — {title}")
+            yield f"- {gid} — {title}"
             notes = g.get("notes")
             if notes:
                 for ln in str(notes).strip().splitlines():
-                    lines.append(f"  {ln}")
-        lines.append("")
+                    yield f"  {ln}"
+        yield ""
     for n in nodes:
-        lines.extend(render_node(n))
-        lines.append("")
-    return "\n".join(lines)
+        yield from render_node_lines(n, "", "", memo, sort_kids=True)
+        yield ""
+
+
+def render(doc: Dict) -> str:
+    return "\n".join(render_lines(doc))
+
+
+def render_to_file(doc: Dict, out: Path):
+    # Stream lines straight to disk rather than joining the whole document first
+    with out.open("w", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(line + "\n" for line in render_lines(doc))
 
 
 def main():
     src = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("project/roadmap.yml")
     out = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("ROADMAP.md")
     doc = load(src)
-    out.write_text(render(doc) + "\n", encoding="utf-8")
+    render_to_file(doc, out)
     print(f"Wrote {out}")
 
 
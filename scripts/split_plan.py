@@ -1,48 +1,78 @@
 #!/usr/bin/env python3
-import sys, pathlib, yaml, textwrap, re
+import sys, os, pathlib, yaml, textwrap, re
+from concurrent.futures import ThreadPoolExecutor
+
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Dedented once here; the loop only fills them in per task
+BRIEF_TMPL = textwrap.dedent("""\
+    # {tid}: {title}
+    Lane: {lane}
+    Plan: {plan_id}
+    Baseline: {baseline}
+
+    ## Scope
+    Implement only what is necessary to satisfy ACCEPTANCE.md.
+
+    ## Deliverables
+    - Code + tests
+    - PR titled "[{tid}] {title}"
+    - PR body includes how you validated acceptance
+
+    ## Blockers
+    (Write here if blocked; 1–2 lines)
+    """)
+
+CURSOR_TMPL = textwrap.dedent("""\
+    You are the Implementer for {tid}: "{title}" in lane {lane}.
+    Work ONLY on files required for this task. Do NOT edit collaboration/**.
+    Create and use branch: feat/{tid}-{slug}
+    Keep changes under 300 lines if possible.
+    Update/add tests to satisfy tasks/{tid}/ACCEPTANCE.md.
+    When done: open a PR titled "[{tid}] {title}" and include validation steps.
+    If blocked, write a single line under "## Blockers" in tasks/{tid}/BRIEF.md.
+    """)
+
+def write_file(path, text):
+    # Each file is written whole, so skip the text/buffered layers of
+    # write_text: encode once and hand the bytes to a single os.write
+    data = memoryview(text.encode('utf-8'))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
 
 if len(sys.argv) < 2:
     print("Usage: split_plan.py <plan.yml>")
     sys.exit(1)
 
-p = pathlib.Path(sys.argv[1]); plan = yaml.safe_load(p.read_text())
+p = pathlib.Path(sys.argv[1]); plan = yaml.load(p.read_text(), Loader=_YAML_LOADER)
 pathlib.Path('tasks').mkdir(exist_ok=True)
 
-for t in plan.get("tasks", []):
+def emit_task(t):
     tid, title, lane = t["id"], t["title"], t.get("lane", "frontend")
-    slug = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')[:40]
+    slug = SLUG_RE.sub('-', title.lower()).strip('-')[:40]
     task_dir = pathlib.Path('tasks')/tid
-    task_dir.mkdir(parents=True, exist_ok=True)
+    os.makedirs(task_dir, exist_ok=True)
 
     acceptance = t.get("acceptance", [])
-    (task_dir/'ACCEPTANCE.md').write_text("# Acceptance\n" + "\n".join(f"- {a}" for a in acceptance) + "\n")
-
-    (task_dir/'BRIEF.md').write_text(textwrap.dedent(f"""\
-        # {tid}: {title}
-        Lane: {lane}
-        Plan: {plan.get('plan_id','')}
-        Baseline: {plan.get('baseline_branch','develop')}
-
-        ## Scope
-        Implement only what is necessary to satisfy ACCEPTANCE.md.
-
-        ## Deliverables
-        - Code + tests
-        - PR titled "[{tid}] {title}"
-        - PR body includes how you validated acceptance
-
-        ## Blockers
-        (Write here if blocked; 1–2 lines)
-        """))
-
-    (task_dir/'.cursor.rules.md').write_text(textwrap.dedent(f"""\
-        You are the Implementer for {tid}: "{title}" in lane {lane}.
-        Work ONLY on files required for this task. Do NOT edit collaboration/**.
-        Create and use branch: feat/{tid}-{slug}
-        Keep changes under 300 lines if possible.
-        Update/add tests to satisfy tasks/{tid}/ACCEPTANCE.md.
-        When done: open a PR titled "[{tid}] {title}" and include validation steps.
-        If blocked, write a single line under "## Blockers" in tasks/{tid}/BRIEF.md.
-        """))
-
-print("Generated task folders for:", ", ".join(t["id"] for t in plan.get("tasks", [])))
+    write_file(task_dir/'ACCEPTANCE.md', "# Acceptance\n" + "\n".join(f"- {a}" for a in acceptance) + "\n")
+
+    write_file(task_dir/'BRIEF.md', BRIEF_TMPL.format(
+        tid=tid, title=title, lane=lane,
+        plan_id=plan.get('plan_id',''), baseline=plan.get('baseline_branch','develop')))
+
+    write_file(task_dir/'.cursor.rules.md', CURSOR_TMPL.format(tid=tid, title=title, lane=lane, slug=slug))
+    return tid
+
+tasks = plan.get("tasks", [])
+# Each task writes only its own directory, so the filesystem work overlaps
+with ThreadPoolExecutor(max_workers=min(32, len(tasks) or 1)) as ex:
+    generated = list(ex.map(emit_task, tasks))
+
+print("Generated task folders for:", ", ".join(generated))
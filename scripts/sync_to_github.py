@@ -21,12 +21,23 @@ import json
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json produces the same layout
+    orjson = None
+
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 REPO = os.getenv("GITHUB_REPOSITORY", "").split("/")
@@ -42,6 +53,32 @@ OUT_DIR = Path("tmp")
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 CREATED_FILE = OUT_DIR / "created_issues.txt"
 
+# Concurrent requests when fanning out over pages/issues
+MAX_WORKERS = 8
+
+# One keep-alive session for every API call in the run. Gateway errors on
+# reads and PATCHes (idempotent here) are retried on the same pool; POSTs are
+# not, so a retry can't create a duplicate issue.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "PATCH"}),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# Markers embedded in issue bodies to tie issues back to roadmap/task ids
+_ROADMAP_RE = re.compile(r"<!--ROADMAP_ID:([^>]+)-->")
+_TASK_RE = re.compile(r"<!--TASK_ID:([^>]+)-->")
+_PAGE_RE = re.compile(r"[?&]page=(\d+)")
+
 
 def gh_headers():
     h = {"Accept": "application/vnd.github+json"}
@@ -51,140 +88,151 @@ def gh_headers():
 
 
 def gh(url: str, method: str = "GET", **kwargs):
-    resp = requests.request(method, url, headers=gh_headers(), timeout=30, **kwargs)
+    resp = SESSION.request(method, url, headers=gh_headers(), timeout=30, **kwargs)
     if resp.status_code >= 400:
         raise RuntimeError(f"GitHub API {method} {url} failed: {resp.status_code} {resp.text[:200]}")
     return resp
 
 
 def list_issues_by_label(label: str) -> List[dict]:
-    issues = []
-    page = 1
-    while True:
-        r = gh(
-            f"{API}/repos/{OWNER}/{REPO_NAME}/issues",
-            params={"labels": label, "state": "all", "per_page": 100, "page": page},
-        )
-        batch = r.json()
-        if not batch:
-            break
-        issues.extend(batch)
-        page += 1
-        if len(batch) < 100:
-            break
+    url = f"{API}/repos/{OWNER}/{REPO_NAME}/issues"
+
+    def fetch(page: int):
+        return gh(url, params={"labels": label, "state": "all", "per_page": 100, "page": page})
+
+    # Page 1's Link header names the last page; fetch the rest concurrently
+    first = fetch(1)
+    issues = first.json()
+    last_url = first.links.get("last", {}).get("url")
+    if last_url:
+        m = _PAGE_RE.search(last_url)
+        last = int(m.group(1)) if m else 1
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            for r in pool.map(fetch, range(2, last + 1)):
+                issues.extend(r.json())
     return issues
 
 
+# Labels already ensured this run; tasks share labels, so check each once
+_LABEL_SEEN = set()
+
+
 def upsert_label(name: str, color: str = "0e8a16"):
     # Create if missing; ignore if exists
-    r = requests.get(f"{API}/repos/{OWNER}/{REPO_NAME}/labels/{name}", headers=gh_headers(), timeout=15)
-    if r.status_code == 200:
+    if name in _LABEL_SEEN:
         return
-    requests.post(
-        f"{API}/repos/{OWNER}/{REPO_NAME}/labels",
-        headers=gh_headers(),
-        json={"name": name, "color": color},
-        timeout=15,
-    )
+    r = SESSION.get(f"{API}/repos/{OWNER}/{REPO_NAME}/labels/{name}", headers=gh_headers(), timeout=15)
+    if r.status_code != 200:
+        SESSION.post(
+            f"{API}/repos/{OWNER}/{REPO_NAME}/labels",
+            headers=gh_headers(),
+            json={"name": name, "color": color},
+            timeout=15,
+        )
+    _LABEL_SEEN.add(name)
+
+
+def issue_matches(issue: dict, fields: Dict) -> bool:
+    """True when a fetched issue already has every field a PATCH would set."""
+    for key, want in fields.items():
+        if key == "labels":
+            have = {lbl["name"] if isinstance(lbl, dict) else lbl for lbl in issue.get("labels") or []}
+            if have != set(want):
+                return False
+        elif key == "body":
+            if (issue.get("body") or "") != want:
+                return False
+        elif issue.get(key) != want:
+            return False
+    return True
 
 
 def load_tasks() -> Dict:
     if not TASKS.exists():
         return {"version": 1, "tasks": []}
-    return json.loads(TASKS.read_text(encoding="utf-8"))
+    raw = TASKS.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def save_tasks(data: Dict):
-    TASKS.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    if orjson is not None:
+        TASKS.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        TASKS.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
 
 def flatten_roadmap_nodes(doc: Dict) -> List[Dict]:
+    # Preorder walk with an explicit stack; deep roadmaps can't hit the recursion limit
     out: List[Dict] = []
-    def walk(n: Dict):
+    stack = list(reversed(doc.get("nodes", []) or []))
+    while stack:
+        n = stack.pop()
         out.append(n)
-        for c in n.get("children", []) or []:
-            walk(c)
-    for root in doc.get("nodes", []) or []:
-        walk(root)
+        stack.extend(reversed(n.get("children", []) or []))
     return out
 
 
-def sync_roadmap_nodes(created: List[int]):
+def sync_roadmap_nodes(created: List[int], links: Dict[str, str]):
     if not ROADMAP.exists():
         return
     upsert_label("roadmap", "0366d6")
-    doc = yaml.safe_load(ROADMAP.read_text(encoding="utf-8")) or {}
-    # Build map of nodes and their children
-    def walk_tree(n: Dict, parent: Optional[str] = None, acc: Dict[str, Dict] = None, edges: Dict[str, List[str]] = None):
-        acc = acc or {}
-        edges = edges or {}
-        nid = n.get("id")
-        acc[nid] = n
-        kids = [c.get("id") for c in (n.get("children") or [])]
-        edges[nid] = kids
-        for c in (n.get("children") or []):
-            walk_tree(c, nid, acc, edges)
-        return acc, edges
-
+    doc = yaml.load(ROADMAP.read_text(encoding="utf-8"), Loader=_YAML_LOADER) or {}
+    # Build map of nodes and their children (preorder)
     all_nodes: Dict[str, Dict] = {}
     edges: Dict[str, List[str]] = {}
-    for root in doc.get("nodes", []) or []:
-        acc, ed = walk_tree(root)
-        all_nodes.update(acc)
-        edges.update(ed)
+    for n in flatten_roadmap_nodes(doc):
+        nid = n.get("id")
+        all_nodes[nid] = n
+        edges[nid] = [c.get("id") for c in (n.get("children") or [])]
 
     existing = list_issues_by_label("roadmap")
     by_marker: Dict[str, dict] = {}
     for iss in existing:
         body = iss.get("body") or ""
-        m = re.search(r"<!--ROADMAP_ID:([^>]+)-->", body)
+        m = _ROADMAP_RE.search(body)
         if m:
             by_marker[m.group(1).strip()] = iss
 
-    # First pass: ensure each node has an issue
-    roadmap_issue_no: Dict[str, int] = {}
-    for nid, n in all_nodes.items():
-        title = n.get("title", "")
+    def header_for(nid: str, n: Dict) -> str:
         status = (n.get("status") or "queued").lower()
         owner = n.get("owner")
-        issue_title = f"[Roadmap] {nid} — {title}"
-        # minimal body for creation; will enrich later
-        base_body = f"<!--ROADMAP_ID:{nid}-->\nStatus: {status}\n" + (f"\nOwner: @{owner}\n" if owner else "")
+        return f"<!--ROADMAP_ID:{nid}-->\nStatus: {status}\n" + (f"\nOwner: @{owner}\n" if owner else "")
+
+    # First pass: create issues for new nodes so every child has a number
+    # before the checklists are written
+    roadmap_issue_no: Dict[str, int] = {}
+    # issue as GitHub currently has it, to skip PATCHes that change nothing
+    current: Dict[str, dict] = {}
+    for nid, n in all_nodes.items():
         exists = by_marker.get(nid)
         if exists:
             number = exists["number"]
-            state = "closed" if status == "done" else "open"
-            gh(
-                f"{API}/repos/{OWNER}/{REPO_NAME}/issues/{number}",
-                method="PATCH",
-                json={"title": issue_title, "body": base_body, "state": state},
-            )
-            roadmap_issue_no[nid] = number
-            created.append(number)
+            links[nid] = exists.get("html_url")
+            current[nid] = exists
         else:
             r = gh(
                 f"{API}/repos/{OWNER}/{REPO_NAME}/issues",
                 method="POST",
-                json={"title": issue_title, "body": base_body, "labels": ["roadmap"]},
+                json={
+                    "title": f"[Roadmap] {nid} — {n.get('title', '')}",
+                    # minimal body for creation; the update below enriches it
+                    "body": header_for(nid, n),
+                    "labels": ["roadmap"],
+                },
             )
-            number = r.json()["number"]
-            roadmap_issue_no[nid] = number
-            if status == "done":
-                gh(
-                    f"{API}/repos/{OWNER}/{REPO_NAME}/issues/{number}",
-                    method="PATCH",
-                    json={"state": "closed"},
-                )
-            created.append(number)
-
-    # Second pass: update bodies with child checklists
-    for nid, n in all_nodes.items():
-        number = roadmap_issue_no.get(nid)
-        if not number:
-            continue
+            issue = r.json()
+            number = issue["number"]
+            links[nid] = issue.get("html_url")
+            current[nid] = issue
+        roadmap_issue_no[nid] = number
+        created.append(number)
+
+    # Second pass: one PATCH per node with title, state and child checklist,
+    # issued concurrently since each is an independent round trip
+    def update(item: Tuple[str, Dict]):
+        nid, n = item
         status = (n.get("status") or "queued").lower()
-        owner = n.get("owner")
-        header = f"<!--ROADMAP_ID:{nid}-->\nStatus: {status}\n" + (f"\nOwner: @{owner}\n" if owner else "")
+        header = header_for(nid, n)
         children = edges.get(nid) or []
         if children:
             lines = [header, "\n### Children", ""]
@@ -201,14 +249,25 @@ def sync_roadmap_nodes(created: List[int]):
             body = "\n".join(lines)
         else:
             body = header
+        fields = {
+            "title": f"[Roadmap] {nid} — {n.get('title', '')}",
+            "body": body,
+            "state": "closed" if status == "done" else "open",
+        }
+        if issue_matches(current[nid], fields):
+            return
         gh(
-            f"{API}/repos/{OWNER}/{REPO_NAME}/issues/{number}",
+            f"{API}/repos/{OWNER}/{REPO_NAME}/issues/{roadmap_issue_no[nid]}",
             method="PATCH",
-            json={"body": body},
+            json=fields,
         )
 
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        # list() so an API error is raised here rather than swallowed
+        list(pool.map(update, all_nodes.items()))
+
 
-def sync_tasks(created: List[int]):
+def sync_tasks(created: List[int], links: Dict[str, str]):
     upsert_label("task", "a2eeef")
     data = load_tasks()
     tasks = data.get("tasks", [])
@@ -216,9 +275,11 @@ def sync_tasks(created: List[int]):
     # Build existing mapping for task issues by marker
     existing_tasks = list_issues_by_label("task")
     by_marker: Dict[str, dict] = {}
+    by_number: Dict[int, dict] = {}
     for iss in existing_tasks:
+        by_number[iss["number"]] = iss
         body = iss.get("body") or ""
-        m = re.search(r"<!--TASK_ID:([^>]+)-->", body)
+        m = _TASK_RE.search(body)
         if m:
             by_marker[m.group(1).strip()] = iss
 
@@ -241,26 +302,37 @@ def sync_tasks(created: List[int]):
         if prio in ("P1", "P2", "P3"):
             upsert_label(prio, "ededed")
             tlabels.append(prio)
+        # A task may repeat a label or list 'task'/its priority itself; dedupe
+        # in order so each label is sent once
+        tlabels = list(dict.fromkeys(tlabels))
         # Determine desired state
         tstatus = (t.get("status") or "queued").lower()
         desired_state = "closed" if tstatus in ("done", "cancelled") else "open"
+        fields = {"title": issue_title, "body": body, "labels": tlabels, "state": desired_state}
         if issue_num:
             # Update title/body if needed
-            gh(
-                f"{API}/repos/{OWNER}/{REPO_NAME}/issues/{issue_num}",
-                method="PATCH",
-                json={"title": issue_title, "body": body, "labels": tlabels, "state": desired_state},
-            )
+            known = by_number.get(int(issue_num))
+            if known is not None and issue_matches(known, fields):
+                links[tid] = known.get("html_url")
+            else:
+                r = gh(
+                    f"{API}/repos/{OWNER}/{REPO_NAME}/issues/{issue_num}",
+                    method="PATCH",
+                    json=fields,
+                )
+                links[tid] = r.json().get("html_url")
             created.append(int(issue_num))
         else:
             exists = by_marker.get(tid)
             if exists:
                 number = exists["number"]
-                gh(
-                    f"{API}/repos/{OWNER}/{REPO_NAME}/issues/{number}",
-                    method="PATCH",
-                    json={"title": issue_title, "body": body, "labels": tlabels, "state": desired_state},
-                )
+                if not issue_matches(exists, fields):
+                    gh(
+                        f"{API}/repos/{OWNER}/{REPO_NAME}/issues/{number}",
+                        method="PATCH",
+                        json=fields,
+                    )
+                links[tid] = exists.get("html_url")
                 # write back
                 ext.setdefault("github", {})["issue"] = number
                 t["external_ids"] = ext
@@ -272,7 +344,9 @@ def sync_tasks(created: List[int]):
                     method="POST",
                     json={"title": issue_title, "body": body, "labels": tlabels},
                 )
-                number = r.json()["number"]
+                issue = r.json()
+                number = issue["number"]
+                links[tid] = issue.get("html_url")
                 ext.setdefault("github", {})["issue"] = number
                 t["external_ids"] = ext
                 # Close immediately if done/cancelled
@@ -293,37 +367,14 @@ def main():
     if not (OWNER and REPO_NAME and TOKEN):
         raise SystemExit("Missing OWNER/REPO or GITHUB_TOKEN in environment")
     created: List[int] = []
-    # Collect mapping during sync by peeking tasks.json after task sync
-    # First roadmap to build id->issue mapping via side effects
-    # Modify functions to store globals? Simpler: re-derive by label markers after sync.
-    sync_roadmap_nodes(created)
-    sync_tasks(created)
+    # links.json maps roadmap id / task id -> issue URL, collected while syncing
+    links = {"roadmap": {}, "tasks": {}}
+    sync_roadmap_nodes(created, links["roadmap"])
+    sync_tasks(created, links["tasks"])
     # Deduplicate and write
     nums = sorted(set(created))
     CREATED_FILE.write_text("\n".join(str(n) for n in nums) + ("\n" if nums else ""), encoding="utf-8")
 
-    # Build links map: roadmap id -> issue URL, task id -> issue URL
-    links = {"roadmap": {}, "tasks": {}}
-    try:
-        road = list_issues_by_label("roadmap")
-        for iss in road:
-            body = iss.get("body") or ""
-            m = re.search(r"<!--ROADMAP_ID:([^>]+)-->", body)
-            if m:
-                rid = m.group(1).strip()
-                links["roadmap"][rid] = iss.get("html_url")
-    except Exception:
-        pass
-    try:
-        task_issues = list_issues_by_label("task")
-        for iss in task_issues:
-            body = iss.get("body") or ""
-            m = re.search(r"<!--TASK_ID:([^>]+)-->", body)
-            if m:
-                tid = m.group(1).strip()
-                links["tasks"][tid] = iss.get("html_url")
-    except Exception:
-        pass
     (Path("project") / "links.json").write_text(json.dumps(links, indent=2), encoding="utf-8")
 
     print(f"Synced issues: {', '.join(map(str, nums)) if nums else '(none)'}")
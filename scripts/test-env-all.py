@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Run every environment check script in one Python process.
+The individual test-env-*.py scripts still work on their own; this saves
+starting an interpreter (and re-importing shared modules) per check.
+"""
+
+import importlib.util
+import os
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (script, entry function) in run order; test-env-config.py pulls in the
+# backend, so it runs last and the lighter checks report even without it
+CHECKS = [
+    ("test-env-simple.py", "test_environment_variables"),
+    ("test-env-with-dotenv.py", "test_environment_configuration"),
+    ("test-env-config.py", "test_environment_config"),
+]
+
+
+def load_script(filename):
+    """Import a hyphenated script file as a module."""
+    name = os.path.splitext(filename)[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(SCRIPTS_DIR, filename)
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    for i, (filename, func) in enumerate(CHECKS):
+        if i:
+            print()
+        getattr(load_script(filename), func)()
+
+
+if __name__ == "__main__":
+    main()
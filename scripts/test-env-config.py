@@ -4,12 +4,19 @@ Test script to verify environment configuration is working correctly.
 Run this to check if all your secrets are being loaded properly.
 """
 
-import sys
+import functools
 import os
+import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
 
-from core.config import settings, validate_configuration  # noqa: E402
+from _env_report import is_sensitive, print_var
+from core.config import settings, validate_configuration
+
+# settings is a process-wide model that doesn't change once loaded, so if
+# test_environment_config() runs more than once in a process only the first
+# run validates
+_validate_configuration = functools.cache(validate_configuration)
 
 
 def test_environment_config():
@@ -17,38 +24,30 @@ def test_environment_config():
     print("🔍 Testing Environment Configuration...")
     print("=" * 50)
 
+    # Field values in one pass instead of a getattr per variable; dict() reads
+    # them as-is, without model_dump's serialisation
+    values = dict(settings)
+
     # Test required variables
     required_vars = ["JWT_SECRET_KEY", "DATABASE_URL", "REDIS_URL", "OPENAI_API_KEY"]
 
     print("📋 Required Variables:")
     for var in required_vars:
-        value = getattr(settings, var.lower(), None)
-        if value:
-            # Mask sensitive values
-            if "key" in var.lower() or "token" in var.lower():
-                masked = value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
-                print(f"  ✅ {var}: {masked}")
-            else:
-                print(f"  ✅ {var}: {value}")
-        else:
-            print(f"  ❌ {var}: NOT SET")
+        value = values.get(var.lower())
+        # Mask sensitive values
+        print_var(var, value, is_sensitive(var, ("key", "token")), "❌", "NOT SET")
 
     print("\n🔧 Optional Variables:")
     optional_vars = ["SENTRY_DSN", "ADMIN_PASSWORD", "API_MODE", "ENVIRONMENT", "DEBUG"]
 
     for var in optional_vars:
-        value = getattr(settings, var.lower(), None)
-        if value:
-            if "dsn" in var.lower() or "password" in var.lower():
-                masked = value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
-                print(f"  ✅ {var}: {masked}")
-            else:
-                print(f"  ✅ {var}: {value}")
-        else:
-            print(f"  ⚠️  {var}: Using default")
+        value = values.get(var.lower())
+        print_var(
+            var, value, is_sensitive(var, ("dsn", "password")), "⚠️ ", "Using default"
+        )
 
     print("\n🔍 Configuration Validation:")
-    if validate_configuration():
+    if _validate_configuration():
         print("  ✅ Configuration validation passed!")
     else:
         print("  ❌ Configuration validation failed!")
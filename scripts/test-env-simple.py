@@ -6,27 +6,27 @@ This doesn't require the full backend dependencies.
 
 import os
 
+from _env_report import is_sensitive, print_var
+
 
 def test_environment_variables():
     """Test if environment variables are loaded correctly."""
     print("🔍 Testing Environment Variables...")
     print("=" * 50)
 
+    # Snapshot the environment once; set_count is kept while printing
+    env = dict(os.environ)
+    set_count = 0
+
     # Test required variables
     required_vars = ["JWT_SECRET_KEY", "DATABASE_URL", "REDIS_URL", "OPENAI_API_KEY"]
 
     print("📋 Required Variables:")
     for var in required_vars:
-        value = os.getenv(var)
-        if value:
-            # Mask sensitive values
-            if "key" in var.lower() or "token" in var.lower():
-                masked = value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
-                print(f"  ✅ {var}: {masked}")
-            else:
-                print(f"  ✅ {var}: {value}")
-        else:
-            print(f"  ❌ {var}: NOT SET")
+        # Mask sensitive values
+        set_count += print_var(
+            var, env.get(var), is_sensitive(var, ("key", "token")), "❌", "NOT SET"
+        )
 
     print("\n🔧 Optional Variables:")
     optional_vars = [
@@ -42,31 +42,24 @@ def test_environment_variables():
     ]
 
     for var in optional_vars:
-        value = os.getenv(var)
-        if value:
-            if (
-                "dsn" in var.lower()
-                or "password" in var.lower()
-                or "token" in var.lower()
-            ):
-                masked = value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
-                print(f"  ✅ {var}: {masked}")
-            else:
-                print(f"  ✅ {var}: {value}")
-        else:
-            print(f"  ⚠️  {var}: Not set (will use default)")
+        set_count += print_var(
+            var,
+            env.get(var),
+            is_sensitive(var, ("dsn", "password", "token")),
+            "⚠️ ",
+            "Not set (will use default)",
+        )
 
     print("\n🌐 Environment Info:")
-    print(f"  Environment: {os.getenv('ENVIRONMENT', 'development')}")
-    print(f"  Debug Mode: {os.getenv('DEBUG', 'false')}")
-    print(f"  API Mode: {os.getenv('API_MODE', 'demo')}")
+    print(f"  Environment: {env.get('ENVIRONMENT', 'development')}")
+    print(f"  Debug Mode: {env.get('DEBUG', 'false')}")
+    print(f"  API Mode: {env.get('API_MODE', 'demo')}")
 
     print("\n" + "=" * 50)
     print("🎉 Environment test complete!")
 
     # Count how many variables are set
     all_vars = required_vars + optional_vars
-    set_count = sum(1 for var in all_vars if os.getenv(var))
     print(f"📊 {set_count}/{len(all_vars)} environment variables are set")
 
 
@@ -4,30 +4,45 @@ Test script that loads .env files and verifies environment configuration.
 This script actually loads the .env files to test if they're working correctly.
 """
 
+import functools
 import os
+import re
 import sys
-from pathlib import Path
+
+# Repo paths, built once as plain strings
+_REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+_BACKEND_ENV = os.path.join(_REPO_ROOT, "backend", ".env")
+_FRONTEND_ENV = os.path.join(_REPO_ROOT, "frontend", ".env")
 
 # Add backend to path
-backend_path = Path(__file__).parent.parent / "backend"
-sys.path.insert(0, str(backend_path))
+sys.path.insert(0, os.path.join(_REPO_ROOT, "backend"))
+
+from _env_report import is_sensitive, print_var
+
+# KEY=value lines, skipping blanks and # comments. The key is everything up
+# to the first "=" (after leading whitespace); surrounding quotes and
+# trailing whitespace are dropped from the value.
+_ENV_LINE_RE = re.compile(
+    r"""^(?![^\S\n]*#)[^\S\n]*([^=\n]*)=["']*(.*?)["']*[^\S\n]*$""", re.MULTILINE
+)
 
 
 def load_env_file(env_path):
     """Load environment variables from a .env file."""
-    if not os.path.exists(env_path):
+    path = os.path.realpath(env_path)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
         return {}
+    # Copy so callers can't mutate the cached parse
+    return dict(_parse_env_file(path, mtime_ns))
 
-    env_vars = {}
-    with open(env_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                # Remove quotes if present
-                value = value.strip("\"'")
-                env_vars[key] = value
-    return env_vars
+
+@functools.lru_cache(maxsize=8)
+def _parse_env_file(path, mtime_ns):
+    # Keyed on mtime as well as path, so an edited file is re-read
+    with open(path, "r") as f:
+        return dict(_ENV_LINE_RE.findall(f.read()))
 
 
 def test_environment_configuration():
@@ -35,35 +50,15 @@ def test_environment_configuration():
     print("🔍 Testing Environment Configuration with .env files...")
     print("=" * 60)
 
-    # Load backend .env file
-    backend_env_path = Path(__file__).parent.parent / "backend" / ".env"
-    frontend_env_path = Path(__file__).parent.parent / "frontend" / ".env"
-
-    print(f"📁 Backend .env: {backend_env_path}")
-    print(f"📁 Frontend .env: {frontend_env_path}")
+    print(f"📁 Backend .env: {_BACKEND_ENV}")
+    print(f"📁 Frontend .env: {_FRONTEND_ENV}")
     print()
 
     # Load environment variables
-    backend_env = load_env_file(backend_env_path)
-    frontend_env = load_env_file(frontend_env_path)
+    backend_env = load_env_file(_BACKEND_ENV)
+    frontend_env = load_env_file(_FRONTEND_ENV)
 
-    # Test required variables
     required_vars = ["JWT_SECRET_KEY", "DATABASE_URL", "REDIS_URL", "OPENAI_API_KEY"]
-
-    print("📋 Required Variables:")
-    for var in required_vars:
-        value = backend_env.get(var)
-        if value and value != f"your-{var.lower().replace('_', '-')}-here":
-            # Mask sensitive values
-            if "key" in var.lower() or "token" in var.lower():
-                masked = value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
-                print(f"  ✅ {var}: {masked}")
-            else:
-                print(f"  ✅ {var}: {value}")
-        else:
-            print(f"  ❌ {var}: NOT SET or using placeholder")
-
-    print("\n🔧 Optional Variables:")
     optional_vars = [
         "SENTRY_DSN",
         "ADMIN_PASSWORD",
@@ -75,40 +70,50 @@ def test_environment_configuration():
         "VERCEL_TOKEN",
         "GITHUB_TOKEN",
     ]
-
-    for var in optional_vars:
-        value = backend_env.get(var)
-        if value and value != f"your-{var.lower().replace('_', '-')}-here":
-            if (
-                "dsn" in var.lower()
-                or "password" in var.lower()
-                or "token" in var.lower()
-            ):
-                masked = value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
-                print(f"  ✅ {var}: {masked}")
-            else:
-                print(f"  ✅ {var}: {value}")
-        else:
-            print(f"  ⚠️  {var}: Not set or using placeholder")
-
-    print("\n🌐 Frontend Variables:")
     frontend_vars = [
         "VITE_API_BASE_URL",
         "VITE_DEBUG",
         "VITE_ENVIRONMENT",
         "VITE_SENTRY_DSN",
     ]
+    all_vars = required_vars + optional_vars + frontend_vars
+    placeholders = {
+        var: f"your-{var.lower().replace('_', '-')}-here" for var in all_vars
+    }
 
+    # Counted while each section prints, so every variable is checked once
+    set_count = 0
+    placeholder_count = 0
+
+    def report(var, env, sensitive_words, icon, missing):
+        # A value still equal to its "your-...-here" placeholder counts as unset
+        nonlocal set_count, placeholder_count
+        value = env.get(var)
+        if value and value == placeholders[var]:
+            placeholder_count += 1
+            value = None
+        set_count += print_var(
+            var, value, is_sensitive(var, sensitive_words), icon, missing
+        )
+
+    print("📋 Required Variables:")
+    for var in required_vars:
+        # Mask sensitive values
+        report(var, backend_env, ("key", "token"), "❌", "NOT SET or using placeholder")
+
+    print("\n🔧 Optional Variables:")
+    for var in optional_vars:
+        report(
+            var,
+            backend_env,
+            ("dsn", "password", "token"),
+            "⚠️ ",
+            "Not set or using placeholder",
+        )
+
+    print("\n🌐 Frontend Variables:")
     for var in frontend_vars:
-        value = frontend_env.get(var)
-        if value and value != f"your-{var.lower().replace('_', '-')}-here":
-            if "dsn" in var.lower():
-                masked = value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
-                print(f"  ✅ {var}: {masked}")
-            else:
-                print(f"  ✅ {var}: {value}")
-        else:
-            print(f"  ⚠️  {var}: Not set or using placeholder")
+        report(var, frontend_env, ("dsn",), "⚠️ ", "Not set or using placeholder")
 
     print("\n🌐 Environment Info:")
     print(f"  Environment: {backend_env.get('ENVIRONMENT', 'development')}")
@@ -119,33 +124,10 @@ def test_environment_configuration():
 
     print("\n" + "=" * 60)
 
-    # Count how many variables are properly set
-    all_vars = required_vars + optional_vars + frontend_vars
-    set_count = 0
-    for var in all_vars:
-        if var in frontend_vars:
-            value = frontend_env.get(var)
-        else:
-            value = backend_env.get(var)
-
-        if value and value != f"your-{var.lower().replace('_', '-')}-here":
-            set_count += 1
-
     print(
         f"📊 {set_count}/{len(all_vars)} environment variables are properly configured"
     )
 
-    # Check for placeholder values
-    placeholder_count = 0
-    for var in all_vars:
-        if var in frontend_vars:
-            value = frontend_env.get(var)
-        else:
-            value = backend_env.get(var)
-
-        if value and value == f"your-{var.lower().replace('_', '-')}-here":
-            placeholder_count += 1
-
     if placeholder_count > 0:
         print(f"⚠️  {placeholder_count} variables still have placeholder values")
         print(